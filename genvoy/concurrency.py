@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import asyncio
+from types import TracebackType
+
+
+class AdmissionGate:
+    """Counting admission gate whose limit can be changed while jobs are in flight."""
+
+    def __init__(self, limit: int):
+        if limit < 1:
+            raise ValueError("AdmissionGate limit must be >= 1")
+        self._limit = limit
+        self._active = 0
+        self._cond = asyncio.Condition()
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    async def acquire(self) -> None:
+        async with self._cond:
+            try:
+                await self._cond.wait_for(lambda: self._active < self._limit)
+            except asyncio.CancelledError:
+                # The release() that woke this waiter must not be lost; hand it to the next one.
+                # A spurious extra wakeup is harmless because wait_for re-checks the predicate.
+                self._cond.notify(1)
+                raise
+            self._active += 1
+
+    async def release(self) -> None:
+        async with self._cond:
+            self._active -= 1
+            self._cond.notify(1)
+
+    async def set_limit(self, limit: int) -> None:
+        """Resize the gate; raising the limit admits waiters immediately, lowering it drains naturally."""
+        if limit < 1:
+            raise ValueError("AdmissionGate limit must be >= 1")
+        async with self._cond:
+            grown = limit - self._limit
+            self._limit = limit
+            if grown > 0:
+                # notify(n) wakes at most the waiters present, so this admits min(grown, waiters).
+                self._cond.notify(grown)
+
+    async def __aenter__(self) -> AdmissionGate:
+        await self.acquire()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        await self.release()
@@ -12,6 +12,9 @@ MAX_BATCH_COUNT = 10
 MAX_COMPARE_MODELS = 6
 MAX_CONCURRENT_JOBS = 8
 
+_dotenv_loaded = False
+_logging_configured = False
+
 
 @dataclass(frozen=True)
 class Settings:
@@ -20,6 +23,10 @@ class Settings:
 
 def configure_logging(level: int = logging.INFO) -> None:
     """Send all Python logs to stderr to keep stdout clean for JSON-RPC."""
+    global _logging_configured
+    if _logging_configured:
+        return
+    _logging_configured = True
     root = logging.getLogger()
     root.setLevel(level)
     if root.handlers:
@@ -32,8 +39,17 @@ def configure_logging(level: int = logging.INFO) -> None:
     root.addHandler(handler)
 
 
-def get_settings(*, require_key: bool = False) -> Settings:
+def _load_dotenv_once() -> None:
+    """Parse `.env` a single time per process; later calls only read `os.environ`."""
+    global _dotenv_loaded
+    if _dotenv_loaded:
+        return
     load_dotenv()
+    _dotenv_loaded = True
+
+
+def get_settings(*, require_key: bool = False) -> Settings:
+    _load_dotenv_once()
     key = os.getenv("FAL_KEY", "").strip()
     if key and not key.lower().startswith("key "):
         key = f"Key {key}"
@@ -8,7 +8,12 @@ class GenvoyToolError(ToolError):
 
     def __init__(self, code: str, message: str):
         self.code = code
-        super().__init__(f"{code}: {message}")
+        self.message = message
+        # Formatting is deferred to __str__; raw args keep the error picklable.
+        super().__init__(code, message)
+
+    def __str__(self) -> str:
+        return f"{self.code}: {self.message}"
 
 
 def ensure(condition: bool, code: str, message: str) -> None:
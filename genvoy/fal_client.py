@@ -1,34 +1,74 @@
 from __future__ import annotations
 
 import asyncio
-import json
-from collections.abc import Awaitable, Callable
+from collections.abc import AsyncIterator, Awaitable, Callable
 from typing import Any
 
 import httpx
+import orjson
 
 from genvoy.errors import GenvoyToolError
+from genvoy.http_client import get_shared_client
 
 BASE_API = "https://api.fal.ai/v1"
 QUEUE_API = "https://queue.fal.run"
 
+_SSE_DATA_PREFIX = b"data:"
+_TERMINAL_STATES = frozenset({"COMPLETED", "FAILED"})
+_JSON_HEADERS = {"Content-Type": "application/json", "Accept": "application/json"}
+_DEFAULT_START_TIMEOUT_SECONDS = 60
+
+# Early polls are quick so short jobs return promptly; later polls use the caller's interval.
+_POLL_DELAYS = (0.2, 0.2, 0.5, 0.5, 1.0)
+
+
+def _poll_delay(attempt: int, poll_interval_seconds: float) -> float:
+    if attempt < len(_POLL_DELAYS):
+        return min(_POLL_DELAYS[attempt], poll_interval_seconds)
+    return poll_interval_seconds
+
+
+async def _iter_sse_lines(response: httpx.Response) -> AsyncIterator[bytes]:
+    """Split a byte stream into lines without decoding; `data:` payloads go straight to orjson."""
+    # Like httpx's LineDecoder, lines end at \r\n, \n or a lone \r. A chunk ending in \r is held back
+    # because the matching \n may open the next chunk.
+    pending = b""
+    async for chunk in response.aiter_bytes():
+        lines = (pending + chunk).splitlines(keepends=True)
+        pending = lines.pop() if lines and not lines[-1].endswith(b"\n") else b""
+        for line in lines:
+            yield line.rstrip(b"\r\n")
+    if pending:
+        yield pending.rstrip(b"\r\n")
+
 
 class FalClient:
-    def __init__(self, fal_key: str, timeout: float = 30.0):
+    def __init__(
+        self,
+        fal_key: str,
+        timeout: float = 30.0,
+        *,
+        client: httpx.AsyncClient | None = None,
+    ):
         if not fal_key:
             raise GenvoyToolError("MISSING_FAL_KEY", "FAL_KEY is not configured.")
         self.fal_key = fal_key
-        self.client = httpx.AsyncClient(
-            timeout=timeout,
-            headers={
-                "Authorization": fal_key,
-                "Content-Type": "application/json",
-                "Accept": "application/json",
-            },
-        )
+        # Bound connect/pool waits separately so a saturated pool cannot silently stretch job timeouts.
+        self.timeout = httpx.Timeout(timeout, connect=5.0, pool=10.0)
+        self.headers = {"Authorization": fal_key, **_JSON_HEADERS}
+        # Default-timeout submissions are the hot path; their headers are merged once here.
+        self._submit_headers = {**self.headers, "X-Fal-Request-Timeout": str(_DEFAULT_START_TIMEOUT_SECONDS)}
+        # Connections are pooled process-wide; this wrapper only carries auth and timeouts.
+        self._client = client
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Resolved per use so long-lived instances follow the shared pool if it is recycled.
+        return self._client if self._client is not None else get_shared_client()
 
     async def aclose(self) -> None:
-        await self.client.aclose()
+        # The pooled client outlives individual FalClient instances; see close_shared_client().
+        return None
 
     async def __aenter__(self) -> "FalClient":
         return self
@@ -36,9 +76,26 @@ class FalClient:
     async def __aexit__(self, exc_type, exc, tb) -> None:
         await self.aclose()
 
-    async def _request(self, method: str, url: str, **kwargs: Any) -> dict[str, Any]:
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: dict[str, str] | None = None,
+        base_headers: dict[str, str] | None = None,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        # `headers` is layered over the defaults (`base_headers`, else the instance set), so callers never
+        # drop auth by passing a subset; without overrides the prebuilt defaults go out as-is.
+        defaults = base_headers or self.headers
         try:
-            response = await self.client.request(method, url, **kwargs)
+            response = await self.client.request(
+                method,
+                url,
+                headers={**defaults, **headers} if headers else defaults,
+                timeout=self.timeout,
+                **kwargs,
+            )
         except httpx.HTTPError as exc:
             raise GenvoyToolError("NETWORK_ERROR", f"fal.ai request failed: {exc}") from exc
 
@@ -67,7 +124,8 @@ class FalClient:
         try:
             response.raise_for_status()
         except httpx.HTTPStatusError as exc:
-            body = response.text[:500]
+            # Decode only the preview; large HTML error pages would otherwise be decoded in full.
+            body = response.content[:500].decode("utf-8", "replace")
             raise GenvoyToolError(
                 "FAL_API_ERROR",
                 f"{response.status_code} response from fal.ai: {body}",
@@ -77,16 +135,19 @@ class FalClient:
             return {}
 
         try:
-            return response.json()
-        except ValueError as exc:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError as exc:
             raise GenvoyToolError("INVALID_RESPONSE", "fal.ai returned non-JSON payload.") from exc
 
     @staticmethod
     def _status_value(payload: dict[str, Any]) -> str:
-        if isinstance(payload.get("data"), dict):
-            nested = payload["data"]
-            return str(nested.get("status") or nested.get("state") or payload.get("status") or payload.get("state") or "").upper()
-        return str(payload.get("status") or payload.get("state") or "").upper()
+        data = payload.get("data")
+        if isinstance(data, dict):
+            value = data.get("status") or data.get("state")
+            if value:
+                return str(value).upper()
+        value = payload.get("status") or payload.get("state")
+        return str(value).upper() if value else ""
 
     async def stream_job_status(
         self,
@@ -99,7 +160,12 @@ class FalClient:
         url = f"{QUEUE_API}/{model_id}/requests/{request_id}/status/stream"
         last_payload: dict[str, Any] | None = None
         try:
-            async with self.client.stream("GET", url, timeout=timeout_seconds) as response:
+            async with self.client.stream(
+                "GET",
+                url,
+                headers=self.headers,
+                timeout=timeout_seconds,
+            ) as response:
                 if response.status_code in {404, 405, 501}:
                     raise GenvoyToolError(
                         "SSE_UNAVAILABLE",
@@ -107,23 +173,32 @@ class FalClient:
                     )
                 response.raise_for_status()
 
-                data_lines: list[str] = []
-                async for line in response.aiter_lines():
-                    if line.startswith("data:"):
-                        data_lines.append(line[5:].lstrip())
+                # Most events carry a single `data:` line; only multi-line events allocate a list.
+                first_data: bytes | None = None
+                extra_data: list[bytes] | None = None
+                async for line in _iter_sse_lines(response):
+                    if line.startswith(_SSE_DATA_PREFIX):
+                        value = line[len(_SSE_DATA_PREFIX) :].lstrip()
+                        if first_data is None:
+                            first_data = value
+                        elif extra_data is None:
+                            extra_data = [value]
+                        else:
+                            extra_data.append(value)
                         continue
                     if line.strip():
                         continue
-                    if not data_lines:
+                    if first_data is None:
                         continue
 
-                    raw = "\n".join(data_lines).strip()
-                    data_lines = []
+                    raw = first_data if extra_data is None else b"\n".join((first_data, *extra_data))
+                    first_data = extra_data = None
                     if not raw:
                         continue
+                    # orjson tolerates surrounding whitespace and rejects blank payloads itself.
                     try:
-                        payload = json.loads(raw)
-                    except json.JSONDecodeError:
+                        payload = orjson.loads(raw)
+                    except orjson.JSONDecodeError:
                         continue
                     if isinstance(payload, dict):
                         last_payload = payload
@@ -132,7 +207,7 @@ class FalClient:
                             if maybe_awaitable is not None:
                                 await maybe_awaitable
                         state = self._status_value(payload)
-                        if state in {"COMPLETED", "FAILED"}:
+                        if state in _TERMINAL_STATES:
                             return payload
         except GenvoyToolError:
             raise
@@ -143,7 +218,7 @@ class FalClient:
 
         if last_payload:
             state = self._status_value(last_payload)
-            if state in {"COMPLETED", "FAILED"}:
+            if state in _TERMINAL_STATES:
                 return last_payload
         raise GenvoyToolError("SSE_UNAVAILABLE", "SSE stream ended without usable status events.")
 
@@ -198,18 +273,21 @@ class FalClient:
         return payload.get("openapi", payload)
 
     async def estimate_cost(self, model_id: str, count: int) -> dict[str, Any]:
-        pricing = await self._request(
-            "GET",
-            f"{BASE_API}/models/pricing",
-            params={"endpoint_id": model_id},
-        )
-        estimate = await self._request(
-            "POST",
-            f"{BASE_API}/models/pricing/estimate",
-            json={
-                "estimate_type": "historical_api_price",
-                "endpoints": {model_id: {"call_quantity": count}},
-            },
+        # Independent lookups; issue both at once so they share one round-trip window.
+        pricing, estimate = await asyncio.gather(
+            self._request(
+                "GET",
+                f"{BASE_API}/models/pricing",
+                params={"endpoint_id": model_id},
+            ),
+            self._request(
+                "POST",
+                f"{BASE_API}/models/pricing/estimate",
+                json={
+                    "estimate_type": "historical_api_price",
+                    "endpoints": {model_id: {"call_quantity": count}},
+                },
+            ),
         )
         return {"pricing": pricing, "estimate": estimate}
 
@@ -224,13 +302,18 @@ class FalClient:
         model_id: str,
         payload: dict[str, Any],
         *,
-        start_timeout_seconds: int = 60,
+        start_timeout_seconds: int = _DEFAULT_START_TIMEOUT_SECONDS,
     ) -> dict[str, Any]:
         return await self._request(
             "POST",
             f"{QUEUE_API}/{model_id}",
             json=payload,
-            headers={"X-Fal-Request-Timeout": str(start_timeout_seconds)},
+            base_headers=self._submit_headers,
+            headers=(
+                None
+                if start_timeout_seconds == _DEFAULT_START_TIMEOUT_SECONDS
+                else {"X-Fal-Request-Timeout": str(start_timeout_seconds)}
+            ),
         )
 
     async def get_job_status(self, model_id: str, request_id: str) -> dict[str, Any]:
@@ -277,6 +360,7 @@ class FalClient:
 
         # Fallback path: polling.
         elapsed = 0.0
+        attempt = 0
         while elapsed < timeout_seconds:
             status = await self.get_job_status(model_id, request_id)
             if on_status:
@@ -288,6 +372,8 @@ class FalClient:
                 return status
             if state == "FAILED":
                 raise GenvoyToolError("JOB_FAILED", f"fal.ai job failed: {status}")
-            await asyncio.sleep(poll_interval_seconds)
-            elapsed += poll_interval_seconds
+            delay = _poll_delay(attempt, poll_interval_seconds)
+            await asyncio.sleep(delay)
+            elapsed += delay
+            attempt += 1
         raise GenvoyToolError("JOB_TIMEOUT", f"Job {request_id} timed out after {timeout_seconds}s.")
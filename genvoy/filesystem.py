@@ -1,17 +1,24 @@
 from __future__ import annotations
 
 import asyncio
+import errno
+import functools
+import os
+import random
+import re
 import shutil
+from collections.abc import Mapping
 from dataclasses import dataclass
 from pathlib import Path
+from types import MappingProxyType
 from urllib.parse import urlparse
 
-import aiofiles
 import httpx
 
 from genvoy.errors import GenvoyToolError
+from genvoy.http_client import get_shared_client
 
-EXT_TO_MEDIA: dict[str, str] = {
+EXT_TO_MEDIA: Mapping[str, str] = MappingProxyType({
     ".png": "image",
     ".jpg": "image",
     ".jpeg": "image",
@@ -20,9 +27,9 @@ EXT_TO_MEDIA: dict[str, str] = {
     ".mp3": "audio",
     ".wav": "audio",
     ".flac": "audio",
-}
+})
 
-CONTENT_TYPE_TO_EXT: dict[str, str] = {
+CONTENT_TYPE_TO_EXT: Mapping[str, str] = MappingProxyType({
     "image/png": ".png",
     "image/jpeg": ".jpg",
     "image/webp": ".webp",
@@ -31,7 +38,11 @@ CONTENT_TYPE_TO_EXT: dict[str, str] = {
     "audio/wav": ".wav",
     "audio/x-wav": ".wav",
     "audio/flac": ".flac",
-}
+})
+
+# Large reads keep event-loop wakeups low; writes are batched so each thread hop moves several MiB.
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+WRITE_BATCH_BYTES = 4 * DOWNLOAD_CHUNK_SIZE
 
 
 @dataclass(frozen=True)
@@ -42,18 +53,27 @@ class DownloadResult:
     content_type: str | None
 
 
-def _is_within(path: Path, root: Path) -> bool:
-    try:
-        path.relative_to(root)
-        return True
-    except ValueError:
-        return False
+@functools.lru_cache(maxsize=8)
+def _resolved_root(root: str) -> Path:
+    # Keyed on the absolute cwd string: chdir still takes effect, but the symlink walk runs once per root.
+    return Path(root).resolve()
+
+
+def reset_path_cache() -> None:
+    _resolved_root.cache_clear()
 
 
 def ensure_safe_path(path: Path, cwd: Path | None = None) -> Path:
-    root = (cwd or Path.cwd()).resolve()
+    # One lstat on the caller's path: a symlink is refused before resolve() can follow it.
+    if path.is_symlink():
+        raise GenvoyToolError(
+            "PATH_TRAVERSAL_BLOCKED",
+            f"Path '{path}' is a symlink; refusing to follow it.",
+        )
+    # abspath keeps a relative cwd such as "." from reusing the root cached for an earlier directory.
+    root = _resolved_root(os.path.abspath(cwd) if cwd is not None else os.getcwd())
     resolved = path.resolve()
-    if not _is_within(resolved, root):
+    if not resolved.is_relative_to(root):
         raise GenvoyToolError(
             "PATH_TRAVERSAL_BLOCKED",
             f"Resolved path '{resolved}' is outside working directory '{root}'.",
@@ -67,25 +87,43 @@ def unique_path(path: Path) -> Path:
     stem = path.stem
     suffix = path.suffix
     parent = path.parent
-    idx = 1
-    while True:
-        candidate = parent / f"{stem}_{idx}{suffix}"
-        if not candidate.exists():
-            return candidate
+    # One directory scan instead of a stat per candidate: take the highest existing suffix + 1. Names are
+    # matched case-insensitively so `hero_1.PNG` counts on case-insensitive filesystems such as APFS or NTFS.
+    pattern = re.compile(rf"{re.escape(stem)}_(\d+){re.escape(suffix)}", re.IGNORECASE)
+    highest = 0
+    try:
+        with os.scandir(parent) as entries:
+            for entry in entries:
+                match = pattern.fullmatch(entry.name)
+                if match:
+                    highest = max(highest, int(match.group(1)))
+    except OSError:
+        pass
+    # Confirm with the filesystem itself, which also covers an unreadable directory.
+    idx = highest + 1
+    while (candidate := parent / f"{stem}_{idx}{suffix}").exists():
         idx += 1
+    return candidate
 
 
 def detect_type_and_ext(url: str, content_type: str | None = None) -> tuple[str, str | None]:
-    parsed = urlparse(url)
-    ext = Path(parsed.path).suffix.lower()
+    # Pure-string suffix extraction; equivalent to Path(...).suffix without building a Path.
+    name = urlparse(url).path.rstrip("/").rpartition("/")[2]
+    stem, _, tail = name.rpartition(".")
+    ext = f".{tail.lower()}" if stem and tail else ""
+    # CDN URLs are unique per job, so memoize on the (suffix, media type) pair rather than the URL.
+    return _detect_cached(ext, content_type.partition(";")[0] if content_type else "")
+
+
+@functools.lru_cache(maxsize=1024)
+def _detect_cached(ext: str, content_type_head: str) -> tuple[str, str | None]:
     media_type = EXT_TO_MEDIA.get(ext, "unknown")
     if media_type != "unknown":
         return media_type, ext
 
-    if not content_type:
+    if not content_type_head:
         return "unknown", None
-    norm = content_type.split(";")[0].strip().lower()
-    canonical_ext = CONTENT_TYPE_TO_EXT.get(norm)
+    canonical_ext = CONTENT_TYPE_TO_EXT.get(content_type_head.strip().lower())
     if not canonical_ext:
         return "unknown", None
     return EXT_TO_MEDIA.get(canonical_ext, "unknown"), canonical_ext
@@ -102,6 +140,23 @@ def resolve_output_path(output_path: str | Path, preferred_ext: str | None = Non
     return unique_path(safe)
 
 
+def _write_batch(path: Path, data: bytearray, append: bool) -> None:
+    # Opens, writes and closes in one worker call, so no descriptor is ever held across an await.
+    with open(path, "ab" if append else "wb") as f:
+        f.write(data)
+
+
+async def _write_off_loop(path: Path, data: bytearray, *, append: bool) -> None:
+    write = asyncio.ensure_future(asyncio.to_thread(_write_batch, path, data, append))
+    try:
+        await asyncio.shield(write)
+    except asyncio.CancelledError:
+        # The worker thread cannot be interrupted; let it finish so cleanup never races a late write.
+        await asyncio.wait((write,))
+        write.exception()
+        raise
+
+
 async def download_to_file(
     url: str,
     output_path: Path,
@@ -110,34 +165,52 @@ async def download_to_file(
 ) -> DownloadResult:
     retries = [0.5, 1.0, 2.0]
     attempt = 0
+    client = get_shared_client()
     while True:
         try:
-            async with httpx.AsyncClient(timeout=timeout_seconds, follow_redirects=True) as client:
-                async with client.stream("GET", url, headers=headers or {}) as response:
-                    if response.status_code in {403, 404}:
-                        raise GenvoyToolError("CDN_EXPIRED", "CDN URL expired or inaccessible.")
-                    response.raise_for_status()
-
-                    content_type = response.headers.get("Content-Type")
-                    media_type, ext = detect_type_and_ext(url, content_type)
-                    path = output_path
-                    if not path.suffix and ext:
-                        path = unique_path(path.with_suffix(ext))
-                    path.parent.mkdir(parents=True, exist_ok=True)
-                    path = ensure_safe_path(path)
-
-                    total = 0
-                    async with aiofiles.open(path, "wb") as f:
-                        async for chunk in response.aiter_bytes():
-                            total += len(chunk)
-                            await f.write(chunk)
-
-                    return DownloadResult(
-                        path=path,
-                        media_type=media_type,
-                        file_size_bytes=total,
-                        content_type=content_type,
-                    )
+            async with client.stream(
+                "GET",
+                url,
+                headers=headers or {},
+                follow_redirects=True,
+                timeout=timeout_seconds,
+            ) as response:
+                if response.status_code in {403, 404}:
+                    raise GenvoyToolError("CDN_EXPIRED", "CDN URL expired or inaccessible.")
+                response.raise_for_status()
+
+                content_type = response.headers.get("Content-Type")
+                media_type, ext = detect_type_and_ext(url, content_type)
+                path = output_path
+                if not path.suffix and ext:
+                    path = unique_path(path.with_suffix(ext))
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path = ensure_safe_path(path)
+
+                total = 0
+                pending = bytearray()
+                appending = False
+                try:
+                    async for chunk in response.aiter_bytes(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        total += len(chunk)
+                        pending += chunk
+                        if len(pending) >= WRITE_BATCH_BYTES:
+                            await _write_off_loop(path, pending, append=appending)
+                            appending = True
+                            pending = bytearray()
+                    # Always runs, so an empty body still produces an (empty) file.
+                    await _write_off_loop(path, pending, append=appending)
+                except BaseException:
+                    # Cancelled or failed part-way: a truncated artifact is worse than none.
+                    path.unlink(missing_ok=True)
+                    raise
+
+                return DownloadResult(
+                    path=path,
+                    media_type=media_type,
+                    file_size_bytes=total,
+                    content_type=content_type,
+                )
         except GenvoyToolError:
             raise
         except httpx.HTTPStatusError as exc:
@@ -145,10 +218,58 @@ async def download_to_file(
         except httpx.HTTPError as exc:
             if attempt >= len(retries):
                 raise GenvoyToolError("DOWNLOAD_FAILED", f"CDN download failed: {exc}") from exc
-            await asyncio.sleep(retries[attempt])
+            # +/-25% jitter so concurrent batch downloads don't retry against the CDN in lockstep.
+            await asyncio.sleep(retries[attempt] * (0.75 + random.random() * 0.5))
             attempt += 1
 
 
+_COPY_FILE_RANGE_UNSUPPORTED = frozenset({errno.EXDEV, errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP})
+_SENDFILE_UNSUPPORTED = frozenset({errno.EINVAL, errno.ENOSYS, errno.ENOTSOCK, errno.EOPNOTSUPP})
+
+
+def _kernel_copy(src: Path, dst: Path) -> None:
+    src_fd = os.open(src, os.O_RDONLY)
+    try:
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            size = os.fstat(src_fd).st_size
+            offset = 0
+            # copy_file_range can reflink on CoW filesystems; cross-device copies raise EXDEV on older kernels.
+            if hasattr(os, "copy_file_range"):
+                try:
+                    while offset < size:
+                        copied = os.copy_file_range(src_fd, dst_fd, size - offset)
+                        if copied == 0:
+                            break
+                        offset += copied
+                except OSError as exc:
+                    if exc.errno not in _COPY_FILE_RANGE_UNSUPPORTED:
+                        raise
+            if offset < size and not hasattr(os, "sendfile"):
+                raise OSError(errno.ENOSYS, "sendfile unavailable")
+            # Both syscalls advance the destination position, so sendfile resumes wherever the first stopped.
+            while offset < size:
+                sent = os.sendfile(dst_fd, src_fd, offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+
+
+def _fast_copy(src: Path, dst: Path) -> None:
+    """Copy file bytes in-kernel (copy_file_range, then sendfile), then mirror metadata like copy2."""
+    try:
+        _kernel_copy(src, dst)
+    except OSError as exc:
+        if exc.errno not in _SENDFILE_UNSUPPORTED:
+            raise
+        shutil.copyfile(src, dst)
+    shutil.copystat(src, dst)
+
+
 async def copy_to_repo(src: Path, dst: str | Path) -> Path:
     target = Path(dst)
     if not target.is_absolute():
@@ -156,6 +277,6 @@ async def copy_to_repo(src: Path, dst: str | Path) -> Path:
     target.parent.mkdir(parents=True, exist_ok=True)
     target = ensure_safe_path(target)
     target = unique_path(target)
-    await asyncio.to_thread(shutil.copy2, src, target)
+    await asyncio.to_thread(_fast_copy, src, target)
     return target
 
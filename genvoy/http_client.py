@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+
+_shared: httpx.AsyncClient | None = None
+# Loop the pooled client was built under; its connections cannot be reused from any other loop.
+_shared_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _running_loop() -> asyncio.AbstractEventLoop | None:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def get_shared_client() -> httpx.AsyncClient:
+    """Return the pooled client for the running event loop, creating it lazily on first use."""
+    global _shared, _shared_loop
+    loop = _running_loop()
+    # A second asyncio.run() gets a fresh pool instead of one whose connections belong to a closed loop.
+    if _shared is None or _shared.is_closed or _shared_loop is not loop:
+        _shared = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=200,
+                max_keepalive_connections=100,
+                keepalive_expiry=30,
+            ),
+            timeout=httpx.Timeout(connect=5.0, read=120.0, write=30.0, pool=10.0),
+            http2=True,
+        )
+        _shared_loop = loop
+    return _shared
+
+
+async def close_shared_client() -> None:
+    """Close the pooled client; the next `get_shared_client()` call builds a fresh one."""
+    global _shared, _shared_loop
+    client, loop = _shared, _shared_loop
+    _shared = _shared_loop = None
+    # A pool left behind by another loop cannot be closed from this one, so it is only dropped.
+    if client is not None and loop in (None, asyncio.get_running_loop()):
+        await client.aclose()
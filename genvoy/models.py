@@ -1,63 +1,64 @@
 from __future__ import annotations
 
+import functools
 import re
-from typing import Any, Literal
+from typing import Annotated, Any, Literal
 
-from pydantic import BaseModel, Field, field_validator, model_validator
+from pydantic import AfterValidator, BaseModel, Field, field_validator, model_validator
+from pydantic_core import PydanticCustomError
 
 from genvoy import config
 
-MODEL_ID_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]*/[A-Za-z0-9][A-Za-z0-9._-]*(/[A-Za-z0-9][A-Za-z0-9._-]*)*$")
+MODEL_ID_PATTERN = re.compile(r"[A-Za-z0-9][A-Za-z0-9._-]*/[A-Za-z0-9][A-Za-z0-9._-]*(/[A-Za-z0-9][A-Za-z0-9._-]*)*")
+
+
+@functools.lru_cache(maxsize=1024)
+def _validate_model_id(value: str) -> None:
+    # Model IDs repeat heavily across calls; only valid IDs are cached since raising skips the cache.
+    if not MODEL_ID_PATTERN.fullmatch(value):
+        raise PydanticCustomError("INVALID_MODEL_ID", "Invalid model ID format.")
+
+
+def _check_model_id(value: str) -> str:
+    _validate_model_id(value)
+    return value
+
+
+def _check_prompt(value: str) -> str:
+    if len(value) > config.MAX_PROMPT_LENGTH:
+        raise PydanticCustomError(
+            "PROMPT_TOO_LONG",
+            "Prompt exceeds MAX_PROMPT_LENGTH ({max_length}).",
+            {"max_length": config.MAX_PROMPT_LENGTH},
+        )
+    return value
+
+
+# Shared field types: one validator object reused by every input model.
+ModelId = Annotated[str, AfterValidator(_check_model_id)]
+Prompt = Annotated[str, AfterValidator(_check_prompt)]
 
 
 class GenerateInput(BaseModel):
-    model_id: str
-    prompt: str
+    model_id: ModelId
+    prompt: Prompt
     output_path: str
     repo_path: str | None = None
     params: dict[str, Any] = Field(default_factory=dict)
 
-    @field_validator("model_id")
-    @classmethod
-    def validate_model_id(cls, value: str) -> str:
-        if not MODEL_ID_PATTERN.match(value):
-            raise ValueError("INVALID_MODEL_ID")
-        return value
-
-    @field_validator("prompt")
-    @classmethod
-    def validate_prompt_length(cls, value: str) -> str:
-        if len(value) > config.MAX_PROMPT_LENGTH:
-            raise ValueError("PROMPT_TOO_LONG")
-        return value
-
 
 class BatchInput(BaseModel):
-    model_id: str
-    prompt: str
+    model_id: ModelId
+    prompt: Prompt
     count: int = Field(ge=1, le=config.MAX_BATCH_COUNT)
     output_dir: str
     repo_dir: str | None = None
     params: dict[str, Any] = Field(default_factory=dict)
 
-    @field_validator("model_id")
-    @classmethod
-    def validate_model_id(cls, value: str) -> str:
-        if not MODEL_ID_PATTERN.match(value):
-            raise ValueError("INVALID_MODEL_ID")
-        return value
-
-    @field_validator("prompt")
-    @classmethod
-    def validate_prompt_length(cls, value: str) -> str:
-        if len(value) > config.MAX_PROMPT_LENGTH:
-            raise ValueError("PROMPT_TOO_LONG")
-        return value
-
 
 class CompareInput(BaseModel):
     model_ids: list[str] = Field(min_length=2, max_length=config.MAX_COMPARE_MODELS)
-    prompt: str
+    prompt: Prompt
     output_dir: str
     repo_dir: str | None = None
     params: dict[str, Any] = Field(default_factory=dict)
@@ -65,16 +66,13 @@ class CompareInput(BaseModel):
     @field_validator("model_ids")
     @classmethod
     def validate_model_ids(cls, value: list[str]) -> list[str]:
+        # Repeated IDs (e.g. re-running a historical comparison) are checked once.
+        seen: set[str] = set()
         for model_id in value:
-            if not MODEL_ID_PATTERN.match(model_id):
-                raise ValueError("INVALID_MODEL_ID")
-        return value
-
-    @field_validator("prompt")
-    @classmethod
-    def validate_prompt_length(cls, value: str) -> str:
-        if len(value) > config.MAX_PROMPT_LENGTH:
-            raise ValueError("PROMPT_TOO_LONG")
+            if model_id in seen:
+                continue
+            seen.add(model_id)
+            _validate_model_id(model_id)
         return value
 
 
@@ -88,34 +86,23 @@ class SearchModelsInput(BaseModel):
     def normalize_cursor(self) -> "SearchModelsInput":
         # Backward compatibility: accept `page` as a deprecated alias for `cursor`.
         if self.cursor and self.page and self.cursor != self.page:
-            raise ValueError("AMBIGUOUS_PAGINATION_CURSOR")
+            raise PydanticCustomError(
+                "AMBIGUOUS_PAGINATION_CURSOR",
+                "Provide only one of cursor or page, or set both to the same value.",
+            )
         if self.cursor is None:
             self.cursor = self.page
         return self
 
 
 class EstimateCostInput(BaseModel):
-    model_id: str
+    model_id: ModelId
     count: int = Field(default=1, ge=1)
 
-    @field_validator("model_id")
-    @classmethod
-    def validate_model_id(cls, value: str) -> str:
-        if not MODEL_ID_PATTERN.match(value):
-            raise ValueError("INVALID_MODEL_ID")
-        return value
-
 
 class JobLookupInput(BaseModel):
     request_id: str = Field(min_length=1)
-    model_id: str
-
-    @field_validator("model_id")
-    @classmethod
-    def validate_model_id(cls, value: str) -> str:
-        if not MODEL_ID_PATTERN.match(value):
-            raise ValueError("INVALID_MODEL_ID")
-        return value
+    model_id: ModelId
 
 
 class GenerateResult(BaseModel):
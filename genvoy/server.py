@@ -1,20 +1,26 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
 import re
+import sys
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Mapping, Sequence
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Any, Literal, cast
+from typing import Any, Literal, TypeVar, cast
 
+import orjson
 from fastmcp import Context, FastMCP
 from fastmcp.server.transforms import ResourcesAsTools
 from pydantic import ValidationError
 
 from genvoy import __version__, config
+from genvoy.concurrency import AdmissionGate
 from genvoy.errors import GenvoyToolError, ensure
 from genvoy.fal_client import FalClient
 from genvoy.filesystem import copy_to_repo, detect_type_and_ext, download_to_file, resolve_output_path
+from genvoy.http_client import close_shared_client
 from genvoy.models import (
     BatchInput,
     BatchResult,
@@ -28,90 +34,150 @@ from genvoy.models import (
 )
 
 logger = logging.getLogger(__name__)
-mcp = FastMCP(name="genvoy", version=__version__)
+_T = TypeVar("_T")
+_PREFERRED_MEDIA_KEYS = ("images", "videos", "audio", "url", "image", "video", "result", "output")
+_MEDIA_TYPES = frozenset({"image", "video", "audio"})
+_SLUG_RE = re.compile(r"[^a-zA-Z0-9._-]+")
+_COST_NUM_RE = re.compile(r"-?\d+(?:\.\d+)?")
+# Status arrives over SSE; polling only runs when the stream is unavailable, so it can be sparse.
+_FALLBACK_POLL_INTERVAL_SECONDS = 5.0
+# Batch/compare budget, counted from the start of the tool call (submission included). Together with the
+# upstream-cancel budget below it stays inside the 600s tool timeout, so partial results still return.
+_FANOUT_DEADLINE_SECONDS = 570.0
+# Best-effort upstream cancel for abandoned jobs; bounded so cancellation itself stays prompt.
+_UPSTREAM_CANCEL_TIMEOUT_SECONDS = 5.0
+# The model catalog changes rarely; re-reads within this window reuse the last encoded snapshot.
+_MODELS_RESOURCE_TTL_SECONDS = 30.0
+_VALIDATION_ERROR_CODES = frozenset({"INVALID_MODEL_ID", "PROMPT_TOO_LONG", "AMBIGUOUS_PAGINATION_CURSOR"})
+
+_COST_PATHS = (
+    ("cost_usd",),
+    ("cost",),
+    ("usage", "cost_usd"),
+    ("usage", "cost"),
+    ("usage", "total_cost"),
+    ("metrics", "cost"),
+)
+_DURATION_PATHS = (
+    ("duration_ms",),
+    ("latency_ms",),
+    ("timings", "duration_ms"),
+    ("timings", "total_ms"),
+    ("metrics", "duration_ms"),
+)
+# Priority order: top-level paths first, then the same paths under a nested `data` object.
+_COST_CANDIDATES = _COST_PATHS + tuple(("data", *path) for path in _COST_PATHS)
+_DURATION_CANDIDATES = _DURATION_PATHS + tuple(("data", *path) for path in _DURATION_PATHS)
+_METRIC_LEAVES = frozenset(_COST_CANDIDATES + _DURATION_CANDIDATES)
+
+
+def _build_metric_trie(paths: tuple[tuple[str, ...], ...]) -> dict[tuple[str, ...], tuple[str, ...]]:
+    # Maps each path prefix to the child keys worth visiting, in first-seen order.
+    trie: dict[tuple[str, ...], tuple[str, ...]] = {}
+    for path in paths:
+        for depth in range(len(path)):
+            children = trie.setdefault(path[:depth], ())
+            if path[depth] not in children:
+                trie[path[:depth]] = (*children, path[depth])
+    return trie
+
+
+_METRIC_TRIE = _build_metric_trie(_COST_CANDIDATES + _DURATION_CANDIDATES)
+
+_CLIENT: FalClient | None = None
+_INFLIGHT: dict[tuple[Any, ...], asyncio.Future[Any]] = {}
+# (client, expires_at, body); tied to the client instance so a key change never serves a stale snapshot.
+_MODELS_RESOURCE_CACHE: tuple[FalClient, float, str] | None = None
+
+
+@asynccontextmanager
+async def _lifespan(server: FastMCP) -> AsyncIterator[dict[str, Any]]:
+    try:
+        yield {}
+    finally:
+        await _close_client()
+
+
+mcp = FastMCP(name="genvoy", version=__version__, lifespan=_lifespan)
 mcp.add_transform(ResourcesAsTools(mcp))
-SEMAPHORE = asyncio.Semaphore(config.MAX_CONCURRENT_JOBS)
+ADMISSION_GATE = AdmissionGate(config.MAX_CONCURRENT_JOBS)
 
 
 def _raise_validation_error(exc: ValidationError) -> None:
-    errors = exc.errors()
-    message = str(errors[0].get("msg", "Validation failed")) if errors else "Validation failed"
-    if "INVALID_MODEL_ID" in message:
-        raise GenvoyToolError("INVALID_MODEL_ID", "Invalid model ID format.")
-    if "PROMPT_TOO_LONG" in message:
-        raise GenvoyToolError(
-            "PROMPT_TOO_LONG",
-            f"Prompt exceeds MAX_PROMPT_LENGTH ({config.MAX_PROMPT_LENGTH}).",
-        )
-    if "AMBIGUOUS_PAGINATION_CURSOR" in message:
-        raise GenvoyToolError(
-            "AMBIGUOUS_PAGINATION_CURSOR",
-            "Provide only one of cursor or page, or set both to the same value.",
-        )
+    # Only the first error is surfaced; skip the URL, input and context fields pydantic would build.
+    errors = exc.errors(include_url=False, include_input=False, include_context=False)
+    if not errors:
+        raise GenvoyToolError("VALIDATION_ERROR", "Validation failed")
+    first = errors[0]
+    message = str(first.get("msg", "Validation failed"))
+    # Model validators raise PydanticCustomError whose `type` is already the stable tool error code.
+    code = first.get("type")
+    if code in _VALIDATION_ERROR_CODES:
+        raise GenvoyToolError(code, message)
     raise GenvoyToolError("VALIDATION_ERROR", message)
 
 
 async def _get_client() -> FalClient:
+    # Reuse one client (and its pooled connections) across tool calls; rebuild only on key change.
+    # Construction is synchronous, so no other task can interleave between check and assignment.
+    global _CLIENT
     settings = config.get_settings(require_key=True)
-    return FalClient(settings.fal_key)
+    if _CLIENT is None or _CLIENT.fal_key != settings.fal_key:
+        _CLIENT = FalClient(settings.fal_key)
+    return _CLIENT
+
+
+async def _close_client() -> None:
+    global _CLIENT, _MODELS_RESOURCE_CACHE
+    _CLIENT = None
+    _MODELS_RESOURCE_CACHE = None
+    await close_shared_client()
 
 
 def _slugify_model_id(model_id: str) -> str:
-    return re.sub(r"[^a-zA-Z0-9._-]+", "-", model_id).strip("-").lower()
+    return _SLUG_RE.sub("-", model_id).strip("-").lower()
 
 
 def _extract_first_media_url(payload: Any) -> str | None:
-    urls: list[str] = []
-
-    if isinstance(payload, str):
-        if payload.startswith("http://") or payload.startswith("https://"):
-            urls.append(payload)
-    elif isinstance(payload, dict):
-        # Prefer common media-bearing keys first.
-        for preferred in ("images", "videos", "audio", "url", "image", "video", "result", "output"):
-            if preferred in payload:
-                found = _extract_first_media_url(payload[preferred])
-                if found:
-                    urls.append(found)
-        for value in payload.values():
-            found = _extract_first_media_url(value)
-            if found:
-                urls.append(found)
-    elif isinstance(payload, list):
-        for item in payload:
-            found = _extract_first_media_url(item)
-            if found:
-                urls.append(found)
-
-    if not urls:
-        return None
-
-    # Prefer URLs with recognized media extension; otherwise return the first URL.
-    for candidate in urls:
-        media_type, _ = detect_type_and_ext(candidate)
-        if media_type in {"image", "video", "audio"}:
-            return candidate
-    return urls[0]
-
-
-def _status_from_payload(payload: dict[str, Any]) -> str:
-    if isinstance(payload.get("data"), dict):
-        nested = payload["data"]
-        return str(
-            nested.get("status")
-            or nested.get("state")
-            or payload.get("status")
-            or payload.get("state")
-            or ""
-        ).upper()
-    return str(payload.get("status") or payload.get("state") or "").upper()
-
-
-def _progress_from_payload(payload: dict[str, Any]) -> float:
-    source: dict[str, Any] = payload
-    if isinstance(payload.get("data"), dict):
-        source = payload["data"]
-
+    # Iterative depth-first walk, preferred keys first; stops at the first URL with a media extension
+    # and otherwise falls back to the first URL seen, matching the old recursive precedence.
+    fallback: str | None = None
+    stack: list[Any] = [payload]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, str):
+            if node.startswith(("http://", "https://")):
+                media_type, _ = detect_type_and_ext(node)
+                if media_type in _MEDIA_TYPES:
+                    return node
+                if fallback is None:
+                    fallback = node
+        elif isinstance(node, dict):
+            children = [node[key] for key in _PREFERRED_MEDIA_KEYS if key in node]
+            children.extend(value for key, value in node.items() if key not in _PREFERRED_MEDIA_KEYS)
+            stack.extend(reversed(children))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+    return fallback
+
+
+def _sources(payload: dict[str, Any]) -> tuple[dict[str, Any], ...]:
+    # fal.ai sometimes wraps status fields in `data`; probe for it once and share the result.
+    nested = payload.get("data")
+    return (payload, nested) if isinstance(nested, dict) else (payload,)
+
+
+def _status_from_sources(sources: tuple[dict[str, Any], ...]) -> str:
+    # Innermost (`data`) first, then the top level.
+    for source in reversed(sources):
+        state = source.get("status") or source.get("state")
+        if state:
+            return str(state).upper()
+    return ""
+
+
+def _progress_from_sources(sources: tuple[dict[str, Any], ...]) -> float:
+    source = sources[-1]
     raw = source.get("progress")
     if raw is None:
         raw = source.get("progress_percent")
@@ -129,64 +195,77 @@ def _progress_from_payload(payload: dict[str, Any]) -> float:
     return max(0.0, min(100.0, value))
 
 
-def _get_nested(data: dict[str, Any], path: tuple[str, ...]) -> Any:
-    cursor: Any = data
-    for key in path:
-        if not isinstance(cursor, dict) or key not in cursor:
-            return None
-        cursor = cursor[key]
-    return cursor
-
-
-def _extract_cost_usd(payload: dict[str, Any]) -> float | None:
-    candidate_paths = [
-        ("cost_usd",),
-        ("cost",),
-        ("usage", "cost_usd"),
-        ("usage", "cost"),
-        ("usage", "total_cost"),
-        ("metrics", "cost"),
-    ]
-    sources = [payload]
-    if isinstance(payload.get("data"), dict):
-        sources.append(payload["data"])
-    for source in sources:
-        for path in candidate_paths:
-            raw = _get_nested(source, path)
-            if raw is None:
+async def _coalesced(key: tuple[Any, ...], factory: Callable[[], Awaitable[_T]]) -> _T:
+    # Identical read-only calls already in flight share one upstream request. The shared task is
+    # shielded so one caller cancelling does not cancel it for the others; the entry is dropped once
+    # it settles, so later calls always see fresh data.
+    task = _INFLIGHT.get(key)
+    if task is None:
+        task = asyncio.ensure_future(factory())
+        _INFLIGHT[key] = task
+
+        def _forget(done: asyncio.Future[Any]) -> None:
+            if _INFLIGHT.get(key) is done:
+                del _INFLIGHT[key]
+            # Every caller may have been cancelled already; retrieving the error here keeps asyncio
+            # from logging "Task exception was never retrieved" for it.
+            if not done.cancelled():
+                done.exception()
+
+        task.add_done_callback(_forget)
+    return cast(_T, await asyncio.shield(task))
+
+
+def _collect_metric_values(payload: dict[str, Any]) -> dict[tuple[str, ...], Any]:
+    # One walk over the payload that follows only the metric-path trie, so shared prefixes
+    # (`usage`, `metrics`, `data`, ...) are looked up once for both cost and duration.
+    found: dict[tuple[str, ...], Any] = {}
+    stack: list[tuple[tuple[str, ...], dict[str, Any]]] = [((), payload)]
+    while stack:
+        path, node = stack.pop()
+        for key in _METRIC_TRIE[path]:
+            if key not in node:
                 continue
-            if isinstance(raw, (int, float)):
-                return float(raw)
-            if isinstance(raw, str):
-                match = re.search(r"-?\d+(?:\.\d+)?", raw)
-                if match:
-                    return float(match.group(0))
+            child_path = (*path, key)
+            value = node[key]
+            if child_path in _METRIC_LEAVES:
+                found[child_path] = value
+            if child_path in _METRIC_TRIE and isinstance(value, dict):
+                stack.append((child_path, value))
+    return found
+
+
+def _cost_from_values(found: dict[tuple[str, ...], Any]) -> float | None:
+    for path in _COST_CANDIDATES:
+        raw = found.get(path)
+        if raw is None:
+            continue
+        if isinstance(raw, (int, float)):
+            return float(raw)
+        if isinstance(raw, str):
+            match = _COST_NUM_RE.search(raw)
+            if match:
+                return float(match.group(0))
     return None
 
 
-def _extract_duration_ms(payload: dict[str, Any]) -> int | None:
-    candidate_paths = [
-        ("duration_ms",),
-        ("latency_ms",),
-        ("timings", "duration_ms"),
-        ("timings", "total_ms"),
-        ("metrics", "duration_ms"),
-    ]
-    sources = [payload]
-    if isinstance(payload.get("data"), dict):
-        sources.append(payload["data"])
-    for source in sources:
-        for path in candidate_paths:
-            raw = _get_nested(source, path)
-            if raw is None:
-                continue
-            try:
-                return int(float(raw))
-            except (TypeError, ValueError):
-                continue
+def _duration_from_values(found: dict[tuple[str, ...], Any]) -> int | None:
+    for path in _DURATION_CANDIDATES:
+        raw = found.get(path)
+        if raw is None:
+            continue
+        try:
+            return int(float(raw))
+        except (TypeError, ValueError):
+            continue
     return None
 
 
+def _extract_metrics(payload: dict[str, Any]) -> tuple[float | None, int | None]:
+    found = _collect_metric_values(payload)
+    return _cost_from_values(found), _duration_from_values(found)
+
+
 async def _wait_for_completion_with_progress(
     client: FalClient,
     *,
@@ -196,13 +275,23 @@ async def _wait_for_completion_with_progress(
     poll_interval_seconds: float,
     ctx: Context | None,
 ) -> dict[str, Any]:
+    last_state: str | None = None
+    last_progress = -1.0
+
     async def _on_status(status: dict[str, Any]) -> None:
-        state = _status_from_payload(status)
-        progress = _progress_from_payload(status)
+        nonlocal last_state, last_progress
+        if ctx is None:
+            return
+        sources = _sources(status)
+        state = _status_from_sources(sources) or "UNKNOWN"
+        progress = _progress_from_sources(sources)
         if state == "COMPLETED":
             progress = 100.0
-        if ctx:
-            await ctx.report_progress(progress, 100.0, f"{model_id} status={state or 'UNKNOWN'}")
+        # SSE heartbeats mostly repeat the previous event; only notify the client on a real change.
+        if state == last_state and abs(progress - last_progress) < 1.0:
+            return
+        last_state, last_progress = state, progress
+        await ctx.report_progress(progress, 100.0, f"{model_id} status={state}")
 
     return await client.wait_for_completion(
         model_id=model_id,
@@ -213,36 +302,55 @@ async def _wait_for_completion_with_progress(
     )
 
 
+def _request_id_from_submit(submit_data: dict[str, Any]) -> str:
+    request_id_raw = submit_data.get("request_id") or submit_data.get("requestId")
+    ensure(bool(request_id_raw), "INVALID_RESPONSE", "fal.ai queue response missing request_id.")
+    return str(request_id_raw)
+
+
+async def _submit_one(client: FalClient, *, model_id: str, prompt: str, params: dict[str, Any]) -> str:
+    payload = {"prompt": prompt, **(params or {})}
+    return _request_id_from_submit(await client.submit_job(model_id, payload))
+
+
+async def _cancel_upstream(client: FalClient, model_id: str, request_id: str) -> None:
+    try:
+        async with asyncio.timeout(_UPSTREAM_CANCEL_TIMEOUT_SECONDS):
+            await client.cancel_job(model_id, request_id)
+    except (GenvoyToolError, TimeoutError) as exc:
+        logger.warning("Could not cancel abandoned job %s/%s: %s", model_id, request_id, exc)
+
+
 async def _generate_once(
+    client: FalClient,
     *,
     model_id: str,
     prompt: str,
     params: dict[str, Any],
     output_path: str | Path,
     repo_path: str | Path | None,
-    timeout_seconds: float,
+    deadline_at: float,
     ctx: Context | None,
 ) -> GenerateResult:
-    async with SEMAPHORE:
-        client = await _get_client()
+    # The slot is held from submission until the result is fetched, so MAX_CONCURRENT_JOBS bounds the
+    # jobs running on fal.ai across all tool calls; the download runs after it is released.
+    async with ADMISSION_GATE:
+        request_id = await _submit_one(client, model_id=model_id, prompt=prompt, params=params)
         try:
-            payload = {"prompt": prompt, **(params or {})}
-            submit_data = await client.submit_job(model_id, payload)
-            request_id_raw = submit_data.get("request_id") or submit_data.get("requestId")
-            ensure(bool(request_id_raw), "INVALID_RESPONSE", "fal.ai queue response missing request_id.")
-            request_id = str(request_id_raw)
-
             terminal_status = await _wait_for_completion_with_progress(
                 client,
                 model_id=model_id,
                 request_id=request_id,
-                timeout_seconds=timeout_seconds,
-                poll_interval_seconds=2.0,
+                # Whatever is left of the caller's budget, so the wait never outlives its tool call.
+                timeout_seconds=max(0.0, deadline_at - asyncio.get_running_loop().time()),
+                poll_interval_seconds=_FALLBACK_POLL_INTERVAL_SECONDS,
                 ctx=ctx,
             )
             result_payload = await client.get_job_result(model_id, request_id)
-        finally:
-            await client.aclose()
+        except asyncio.CancelledError:
+            # The job was already submitted; without this it keeps running (and billing) on fal.ai.
+            await _cancel_upstream(client, model_id, request_id)
+            raise
 
     result_url_raw = _extract_first_media_url(result_payload)
     ensure(bool(result_url_raw), "INVALID_RESPONSE", "No media URL found in fal.ai result payload.")
@@ -250,11 +358,10 @@ async def _generate_once(
 
     _, ext = detect_type_and_ext(result_url)
     resolved_output = resolve_output_path(output_path, preferred_ext=ext)
-    settings = config.get_settings(require_key=True)
     download = await download_to_file(
         result_url,
         resolved_output,
-        headers={"Authorization": settings.fal_key},
+        headers={"Authorization": client.fal_key},
     )
 
     copied_to_repo: Path | None = None
@@ -264,12 +371,15 @@ async def _generate_once(
             repo_target = repo_target.with_suffix(download.path.suffix)
         copied_to_repo = await copy_to_repo(download.path, repo_target)
 
-    duration_ms = _extract_duration_ms(result_payload) or _extract_duration_ms(terminal_status)
-    cost_usd = _extract_cost_usd(result_payload) or _extract_cost_usd(terminal_status)
+    cost_usd, duration_ms = _extract_metrics(result_payload)
+    if not cost_usd or not duration_ms:
+        status_cost, status_duration = _extract_metrics(terminal_status)
+        cost_usd = cost_usd or status_cost
+        duration_ms = duration_ms or status_duration
 
     media_type: Literal["image", "video", "audio", "unknown"] = (
         cast(Literal["image", "video", "audio"], download.media_type)
-        if download.media_type in {"image", "video", "audio"}
+        if download.media_type in _MEDIA_TYPES
         else "unknown"
     )
 
@@ -286,6 +396,71 @@ async def _generate_once(
     )
 
 
+async def _collect_fanout(
+    jobs: Sequence[tuple[Mapping[str, Any], Awaitable[GenerateResult]]],
+    ctx: Context | None,
+    *,
+    deadline_at: float,
+) -> tuple[list[GenerateResult], list[dict[str, Any]]]:
+    """Reap labelled jobs as they finish, reporting batch progress, until the fan-out deadline."""
+
+    async def _settle(job: Awaitable[GenerateResult]) -> GenerateResult | Exception:
+        try:
+            return await job
+        except Exception as exc:
+            return exc
+
+    tasks = [asyncio.ensure_future(_settle(job)) for _, job in jobs]
+    total = len(tasks)
+    deadline = asyncio.timeout_at(deadline_at)
+    try:
+        async with deadline:
+            finished = 0
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    await next_done
+                except asyncio.CancelledError:
+                    # A job cancelled from inside is reported below; only our own cancellation propagates.
+                    current = asyncio.current_task()
+                    if current is not None and current.cancelling():
+                        raise
+                finished += 1
+                if ctx:
+                    await ctx.report_progress(finished * 100.0 / total, 100.0, f"{finished}/{total} jobs finished")
+    except TimeoutError:
+        pass
+    finally:
+        # Stragglers (deadline hit or client abort) are cancelled and awaited so their gate slots and
+        # connections are released before returning.
+        pending = [task for task in tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+    # Assemble in job order rather than completion order so outputs line up with their prompts.
+    files: list[GenerateResult] = []
+    failed: list[dict[str, Any]] = []
+    for (label, _), task in zip(jobs, tasks):
+        outcome: GenerateResult | BaseException = asyncio.CancelledError() if task.cancelled() else task.result()
+        if isinstance(outcome, BaseException):
+            failed.append({**label, **_failure_entry(outcome, deadline_expired=deadline.expired())})
+        else:
+            files.append(outcome)
+    return files, failed
+
+
+def _failure_entry(exc: BaseException, *, deadline_expired: bool = False) -> dict[str, Any]:
+    if isinstance(exc, asyncio.CancelledError):
+        # Only blame the deadline when it actually fired; jobs can also be cancelled from elsewhere.
+        reason = (
+            f"Job did not finish before the {_FANOUT_DEADLINE_SECONDS:g}s deadline."
+            if deadline_expired
+            else "Job was cancelled before it finished."
+        )
+        return {"error": f"JOB_CANCELLED: {reason}", "cancelled": True}
+    return {"error": str(exc)}
+
+
 @mcp.tool(
     name="search_models",
     timeout=15,
@@ -304,10 +479,10 @@ async def search_models(
     except ValidationError as exc:
         _raise_validation_error(exc)
     client = await _get_client()
-    try:
-        return await client.search_models(data.query, data.category, data.cursor)
-    finally:
-        await client.aclose()
+    return await _coalesced(
+        ("search_models", data.query, data.category, data.cursor),
+        lambda: client.search_models(data.query, data.category, data.cursor),
+    )
 
 
 @mcp.tool(
@@ -322,10 +497,7 @@ async def get_schema(ctx: Context, model_id: str) -> dict[str, Any]:
     except ValidationError as exc:
         _raise_validation_error(exc)
     client = await _get_client()
-    try:
-        return await client.get_schema(data.model_id)
-    finally:
-        await client.aclose()
+    return await _coalesced(("get_schema", data.model_id), lambda: client.get_schema(data.model_id))
 
 
 @mcp.tool(
@@ -340,10 +512,10 @@ async def estimate_cost(ctx: Context, model_id: str, count: int = 1) -> dict[str
     except ValidationError as exc:
         _raise_validation_error(exc)
     client = await _get_client()
-    try:
-        return await client.estimate_cost(data.model_id, data.count)
-    finally:
-        await client.aclose()
+    return await _coalesced(
+        ("estimate_cost", data.model_id, data.count),
+        lambda: client.estimate_cost(data.model_id, data.count),
+    )
 
 
 @mcp.tool(
@@ -376,13 +548,16 @@ async def generate(
     except ValidationError as exc:
         _raise_validation_error(exc)
 
+    deadline_at = asyncio.get_running_loop().time() + 360.0
+    client = await _get_client()
     result = await _generate_once(
+        client,
         model_id=data.model_id,
         prompt=data.prompt,
         params=data.params,
         output_path=data.output_path,
         repo_path=data.repo_path,
-        timeout_seconds=360.0,
+        deadline_at=deadline_at,
         ctx=ctx,
     )
     return result.model_dump()
@@ -420,31 +595,33 @@ async def generate_batch(
     except ValidationError as exc:
         _raise_validation_error(exc)
 
+    # The fan-out budget starts before anything is submitted; every job and the reaper share it.
+    deadline_at = asyncio.get_running_loop().time() + _FANOUT_DEADLINE_SECONDS
     output_base = Path(data.output_dir)
     output_base.mkdir(parents=True, exist_ok=True)
+    repo_root = Path(data.repo_dir) if data.repo_dir else None
     slug = _slugify_model_id(data.model_id)
+    names = [f"{slug}_{idx}" for idx in range(1, data.count + 1)]
 
-    tasks = [
-        _generate_once(
-            model_id=data.model_id,
-            prompt=data.prompt,
-            params=data.params,
-            output_path=output_base / f"{slug}_{idx + 1}",
-            repo_path=(Path(data.repo_dir) / f"{slug}_{idx + 1}") if data.repo_dir else None,
-            timeout_seconds=600.0,
-            ctx=ctx,
+    client = await _get_client()
+    jobs = [
+        (
+            {"index": idx},
+            _generate_once(
+                client,
+                model_id=data.model_id,
+                prompt=data.prompt,
+                params=data.params,
+                output_path=output_base / name,
+                repo_path=repo_root / name if repo_root else None,
+                deadline_at=deadline_at,
+                # _collect_fanout owns the progress stream; per-job 0-100 reports would interleave.
+                ctx=None,
+            ),
         )
-        for idx in range(data.count)
+        for idx, name in enumerate(names, start=1)
     ]
-    results = await asyncio.gather(*tasks, return_exceptions=True)
-
-    files: list[GenerateResult] = []
-    failed: list[dict[str, Any]] = []
-    for idx, item in enumerate(results):
-        if isinstance(item, BaseException):
-            failed.append({"index": idx + 1, "error": str(item)})
-        else:
-            files.append(cast(GenerateResult, item))
+    files, failed = await _collect_fanout(jobs, ctx, deadline_at=deadline_at)
 
     return BatchResult(files=files, failed=failed).model_dump()
 
@@ -479,32 +656,32 @@ async def generate_compare(
     except ValidationError as exc:
         _raise_validation_error(exc)
 
+    # The fan-out budget starts before anything is submitted; every job and the reaper share it.
+    deadline_at = asyncio.get_running_loop().time() + _FANOUT_DEADLINE_SECONDS
     output_base = Path(data.output_dir)
     output_base.mkdir(parents=True, exist_ok=True)
+    repo_root = Path(data.repo_dir) if data.repo_dir else None
+    slugs = list(map(_slugify_model_id, data.model_ids))
 
-    tasks = []
-    for model_id in data.model_ids:
-        slug = _slugify_model_id(model_id)
-        tasks.append(
+    client = await _get_client()
+    jobs = [
+        (
+            {"model_id": model_id},
             _generate_once(
+                client,
                 model_id=model_id,
                 prompt=data.prompt,
                 params=data.params,
                 output_path=output_base / slug,
-                repo_path=(Path(data.repo_dir) / slug) if data.repo_dir else None,
-                timeout_seconds=600.0,
-                ctx=ctx,
-            )
+                repo_path=repo_root / slug if repo_root else None,
+                deadline_at=deadline_at,
+                # _collect_fanout owns the progress stream; per-job 0-100 reports would interleave.
+                ctx=None,
+            ),
         )
-
-    results = await asyncio.gather(*tasks, return_exceptions=True)
-    files: list[GenerateResult] = []
-    failed: list[dict[str, Any]] = []
-    for model_id, item in zip(data.model_ids, results):
-        if isinstance(item, BaseException):
-            failed.append({"model_id": model_id, "error": str(item)})
-        else:
-            files.append(cast(GenerateResult, item))
+        for model_id, slug in zip(data.model_ids, slugs)
+    ]
+    files, failed = await _collect_fanout(jobs, ctx, deadline_at=deadline_at)
 
     return CompareResult(files=files, failed=failed).model_dump()
 
@@ -521,10 +698,10 @@ async def get_job_status(ctx: Context, request_id: str, model_id: str) -> dict[s
     except ValidationError as exc:
         _raise_validation_error(exc)
     client = await _get_client()
-    try:
-        return await client.get_job_status(data.model_id, data.request_id)
-    finally:
-        await client.aclose()
+    return await _coalesced(
+        ("get_job_status", data.model_id, data.request_id),
+        lambda: client.get_job_status(data.model_id, data.request_id),
+    )
 
 
 @mcp.tool(
@@ -539,37 +716,56 @@ async def cancel_job(ctx: Context, request_id: str, model_id: str) -> dict[str,
     except ValidationError as exc:
         _raise_validation_error(exc)
     client = await _get_client()
-    try:
-        return await client.cancel_job(data.model_id, data.request_id)
-    finally:
-        await client.aclose()
+    return await client.cancel_job(data.model_id, data.request_id)
+
+
+def _dump_resource(payload: Any) -> str:
+    # Payloads were decoded by orjson, so they always re-encode. Output matches
+    # json.dumps(indent=2, ensure_ascii=False): non-ASCII text is written as raw UTF-8, not \u escapes,
+    # which is still valid JSON and is accepted for MCP's UTF-8 text contents.
+    return orjson.dumps(payload, option=orjson.OPT_INDENT_2).decode()
 
 
 @mcp.resource("genvoy://models")
 async def models_resource() -> str:
     """Return a JSON snapshot of available fal.ai models for resource-aware MCP clients."""
+    global _MODELS_RESOURCE_CACHE
     client = await _get_client()
-    try:
-        payload = await client.list_models()
-    finally:
-        await client.aclose()
-    return json.dumps(payload, indent=2)
+    cached = _MODELS_RESOURCE_CACHE
+    now = time.monotonic()
+    if cached is not None and cached[0] is client and now < cached[1]:
+        return cached[2]
+    body = _dump_resource(await client.list_models())
+    _MODELS_RESOURCE_CACHE = (client, now + _MODELS_RESOURCE_TTL_SECONDS, body)
+    return body
 
 
 @mcp.resource("genvoy://recent")
 async def recent_resource() -> str:
     """Return recent usage history from fal.ai (requires Admin API key scope)."""
     client = await _get_client()
+    payload = await client.list_recent()
+    return _dump_resource(payload)
+
+
+def _install_uvloop() -> bool:
+    """Use uvloop for the server's event loop when the optional `speedups` extra is installed."""
+    if sys.platform == "win32":
+        return False
     try:
-        payload = await client.list_recent()
-    finally:
-        await client.aclose()
-    return json.dumps(payload, indent=2)
+        import uvloop
+    except ImportError:
+        return False
+    # anyio builds its loop through the active policy, so setting it here covers mcp.run().
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
 
 
 def main() -> None:
     # Fail fast on startup if key is missing.
     config.get_settings(require_key=True)
+    if _install_uvloop():
+        logger.info("Using uvloop event loop.")
     logger.info("Starting Genvoy MCP server.")
     mcp.run()
 
@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+import pytest
+
+from genvoy.fal_client import FalClient
+
+
+@pytest.fixture(scope="session")
+def fal_client() -> FalClient:
+    # FalClient borrows the process-wide pool and holds no resources of its own, so one instance
+    # serves the whole run and needs no async teardown.
+    return FalClient("Key test")
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from genvoy.concurrency import AdmissionGate
+
+
+# Expected behavior: the gate should never admit more concurrent holders than its limit.
+async def test_admission_gate_bounds_concurrency() -> None:
+    gate = AdmissionGate(2)
+    peak = 0
+
+    async def _job() -> None:
+        nonlocal peak
+        async with gate:
+            peak = max(peak, gate.active)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(_job() for _ in range(6)))
+    assert peak == 2
+    assert gate.active == 0
+
+
+# Expected behavior: raising the limit should admit exactly as many blocked waiters as slots were added.
+async def test_admission_gate_set_limit_admits_new_slots_only() -> None:
+    gate = AdmissionGate(1)
+    await gate.acquire()
+    waiters = [asyncio.create_task(gate.acquire()) for _ in range(3)]
+    await asyncio.sleep(0)
+    assert not any(waiter.done() for waiter in waiters)
+
+    await gate.set_limit(3)
+    await asyncio.sleep(0)
+    assert [waiter.done() for waiter in waiters] == [True, True, False]
+    assert gate.active == 3
+    assert gate.limit == 3
+
+    await gate.release()
+    await asyncio.wait_for(waiters[2], timeout=1.0)
+    assert gate.active == 3
+
+
+# Expected behavior: lowering the limit should leave current holders alone and admit no one until they drain.
+async def test_admission_gate_lowered_limit_drains_before_admitting() -> None:
+    gate = AdmissionGate(2)
+    await gate.acquire()
+    await gate.acquire()
+    await gate.set_limit(1)
+    waiter = asyncio.create_task(gate.acquire())
+
+    await gate.release()
+    await asyncio.sleep(0)
+    assert not waiter.done()
+    await gate.release()
+    await asyncio.wait_for(waiter, timeout=1.0)
+    assert gate.active == 1
+    await gate.release()
+
+
+# Expected behavior: a resized gate should still reject non-positive limits.
+async def test_admission_gate_set_limit_rejects_invalid_limit() -> None:
+    gate = AdmissionGate(1)
+    with pytest.raises(ValueError):
+        await gate.set_limit(0)
+    assert gate.limit == 1
+
+
+# Expected behavior: cancelling a blocked waiter should leave the active count untouched.
+async def test_admission_gate_cancelled_waiter_does_not_leak_slot() -> None:
+    gate = AdmissionGate(1)
+    await gate.acquire()
+    waiter = asyncio.create_task(gate.acquire())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    await gate.release()
+    assert gate.active == 0
+    async with gate:
+        assert gate.active == 1
+
+
+# Expected behavior: non-positive limits should be rejected.
+def test_admission_gate_rejects_invalid_limit() -> None:
+    with pytest.raises(ValueError):
+        AdmissionGate(0)
+
+
+# Expected behavior: a waiter cancelled after being woken should pass its wakeup on to the next waiter.
+async def test_admission_gate_notified_then_cancelled_waiter_hands_off_slot() -> None:
+    gate = AdmissionGate(1)
+    await gate.acquire()
+    first = asyncio.create_task(gate.acquire())
+    second = asyncio.create_task(gate.acquire())
+    await asyncio.sleep(0)
+
+    await gate.release()
+    first.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    await asyncio.wait_for(second, timeout=1.0)
+    assert gate.active == 1
+    await gate.release()
@@ -5,6 +5,7 @@ import sys
 
 import pytest
 
+from genvoy import config
 from genvoy.config import configure_logging, get_settings
 
 
@@ -30,10 +31,11 @@ def test_get_settings_keeps_prefixed_key(monkeypatch: pytest.MonkeyPatch) -> Non
 
 
 # Expected behavior: logging configuration should attach a stderr stream handler when none exist.
-def test_configure_logging_targets_stderr() -> None:
+def test_configure_logging_targets_stderr(monkeypatch: pytest.MonkeyPatch) -> None:
     root = logging.getLogger()
     original_handlers = list(root.handlers)
     try:
+        monkeypatch.setattr(config, "_logging_configured", False)
         root.handlers = []
         configure_logging()
         assert root.handlers, "configure_logging should add at least one handler"
@@ -42,3 +44,36 @@ def test_configure_logging_targets_stderr() -> None:
         assert handler.stream is sys.stderr
     finally:
         root.handlers = original_handlers
+
+
+# Expected behavior: once configured, later calls should not attach handlers again.
+def test_configure_logging_is_idempotent(monkeypatch: pytest.MonkeyPatch) -> None:
+    root = logging.getLogger()
+    original_handlers = list(root.handlers)
+    try:
+        monkeypatch.setattr(config, "_logging_configured", False)
+        root.handlers = []
+        configure_logging()
+        root.handlers = []
+        configure_logging()
+        assert root.handlers == []
+    finally:
+        root.handlers = original_handlers
+
+
+# Expected behavior: `.env` should be parsed once per process while env lookups stay live.
+def test_get_settings_loads_dotenv_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    loads = 0
+
+    def _fake_load_dotenv() -> bool:
+        nonlocal loads
+        loads += 1
+        return True
+
+    monkeypatch.setattr(config, "_dotenv_loaded", False)
+    monkeypatch.setattr(config, "load_dotenv", _fake_load_dotenv)
+    monkeypatch.setenv("FAL_KEY", "first")
+    assert get_settings().fal_key == "Key first"
+    monkeypatch.setenv("FAL_KEY", "second")
+    assert get_settings().fal_key == "Key second"
+    assert loads == 1
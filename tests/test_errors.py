@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import pickle
+
+import pytest
+
+from genvoy.errors import GenvoyToolError, ensure
+
+
+# Expected behavior: string form should combine code and message for MCP error payloads.
+def test_tool_error_str_combines_code_and_message() -> None:
+    err = GenvoyToolError("RATE_LIMITED", "slow down")
+    assert str(err) == "RATE_LIMITED: slow down"
+    assert err.code == "RATE_LIMITED"
+    assert err.message == "slow down"
+
+
+# Expected behavior: errors should survive pickling (e.g. across process pools) with code intact.
+def test_tool_error_round_trips_through_pickle() -> None:
+    restored = pickle.loads(pickle.dumps(GenvoyToolError("CDN_EXPIRED", "gone")))
+    assert restored.code == "CDN_EXPIRED"
+    assert str(restored) == "CDN_EXPIRED: gone"
+
+
+# Expected behavior: ensure should raise only when the condition is false.
+def test_ensure_raises_on_false_condition() -> None:
+    ensure(True, "UNUSED", "never raised")
+    with pytest.raises(GenvoyToolError) as exc:
+        ensure(False, "INVALID_RESPONSE", "missing field")
+    assert exc.value.code == "INVALID_RESPONSE"
@@ -9,7 +9,6 @@ from genvoy.fal_client import BASE_API, FalClient
 
 
 # Expected behavior: model search should call platform endpoint and return parsed JSON payload.
-@pytest.mark.asyncio
 async def test_search_models_happy_path() -> None:
     client = FalClient("Key test")
     try:
@@ -25,7 +24,6 @@ async def test_search_models_happy_path() -> None:
 
 
 # Expected behavior: cursor-based pagination should be forwarded as `cursor` query param.
-@pytest.mark.asyncio
 async def test_search_models_uses_cursor_param() -> None:
     client = FalClient("Key test")
     try:
@@ -39,7 +37,6 @@ async def test_search_models_uses_cursor_param() -> None:
 
 
 # Expected behavior: legacy `page` input should continue to work by mapping to `cursor`.
-@pytest.mark.asyncio
 async def test_search_models_page_alias_maps_to_cursor() -> None:
     client = FalClient("Key test")
     try:
@@ -54,7 +51,6 @@ async def test_search_models_page_alias_maps_to_cursor() -> None:
 
 
 # Expected behavior: HTTP 429 should map to RATE_LIMITED with retry metadata preserved in message.
-@pytest.mark.asyncio
 async def test_request_maps_rate_limit_error() -> None:
     client = FalClient("Key test")
     try:
@@ -71,7 +67,6 @@ async def test_request_maps_rate_limit_error() -> None:
 
 
 # Expected behavior: queue start timeout should map to QUEUE_START_TIMEOUT for actionable retries.
-@pytest.mark.asyncio
 async def test_submit_job_maps_queue_start_timeout() -> None:
     client = FalClient("Key test")
     try:
@@ -91,7 +86,6 @@ async def test_submit_job_maps_queue_start_timeout() -> None:
 
 
 # Expected behavior: malformed non-JSON success payloads should raise INVALID_RESPONSE.
-@pytest.mark.asyncio
 async def test_request_rejects_non_json_success_payload() -> None:
     client = FalClient("Key test")
     try:
@@ -107,7 +101,6 @@ async def test_request_rejects_non_json_success_payload() -> None:
 
 
 # Expected behavior: usage-history endpoint should return a clear admin-key-required error on 403 scope failures.
-@pytest.mark.asyncio
 async def test_list_recent_maps_admin_key_required_on_403() -> None:
     client = FalClient("Key test")
     try:
@@ -122,7 +115,6 @@ async def test_list_recent_maps_admin_key_required_on_403() -> None:
 
 
 # Expected behavior: SSE parser should emit live status updates and stop at terminal COMPLETED.
-@pytest.mark.asyncio
 async def test_stream_job_status_parses_sse_events(monkeypatch: pytest.MonkeyPatch) -> None:
     client = FalClient("Key test")
 
@@ -132,11 +124,11 @@ async def test_stream_job_status_parses_sse_events(monkeypatch: pytest.MonkeyPat
         def raise_for_status(self) -> None:
             return None
 
-        async def aiter_lines(self):
-            yield 'data: {"status":"IN_PROGRESS","progress":15}'
-            yield ""
-            yield 'data: {"status":"COMPLETED","progress":100}'
-            yield ""
+        async def aiter_bytes(self):
+            # Chunk boundaries deliberately split lines to exercise the byte-level splitter.
+            yield b': heartbeat\r\n\r\ndata: {"status":"IN_PRO'
+            yield b'GRESS","progress":15}\n\ndata: {"status":"COMPLETED",'
+            yield b'"progress":100}\n\n'
 
     class _FakeStreamCtx:
         async def __aenter__(self):
@@ -145,7 +137,7 @@ async def test_stream_job_status_parses_sse_events(monkeypatch: pytest.MonkeyPat
         async def __aexit__(self, exc_type, exc, tb):
             return None
 
-    def _fake_stream(method: str, url: str, timeout: float | None = None):
+    def _fake_stream(method: str, url: str, headers=None, timeout: float | None = None):
         return _FakeStreamCtx()
 
     updates: list[str] = []
@@ -164,7 +156,6 @@ async def test_stream_job_status_parses_sse_events(monkeypatch: pytest.MonkeyPat
 
 
 # Expected behavior: when SSE is unavailable, wait_for_completion should fall back to polling.
-@pytest.mark.asyncio
 async def test_wait_for_completion_falls_back_to_polling(monkeypatch: pytest.MonkeyPatch) -> None:
     client = FalClient("Key test")
     statuses = [{"status": "IN_PROGRESS", "progress": 25}, {"status": "COMPLETED", "progress": 100}]
@@ -203,3 +194,36 @@ async def test_wait_for_completion_falls_back_to_polling(monkeypatch: pytest.Mon
     assert terminal["status"] == "COMPLETED"
     assert poll_calls >= 2
     assert observed == ["IN_PROGRESS", "COMPLETED"]
+
+
+# Expected behavior: polling fallback should start with short delays and settle on the caller's interval.
+async def test_wait_for_completion_escalates_poll_delays(monkeypatch: pytest.MonkeyPatch) -> None:
+    client = FalClient("Key test")
+    poll_calls = 0
+    delays: list[float] = []
+
+    async def _stream_unavailable(*args, **kwargs):
+        raise GenvoyToolError("SSE_UNAVAILABLE", "stream down")
+
+    async def _fake_get_job_status(model_id: str, request_id: str):
+        nonlocal poll_calls
+        poll_calls += 1
+        return {"status": "COMPLETED" if poll_calls > 7 else "IN_QUEUE"}
+
+    async def _record_sleep(delay: float):
+        delays.append(delay)
+
+    try:
+        monkeypatch.setattr(client, "stream_job_status", _stream_unavailable)
+        monkeypatch.setattr(client, "get_job_status", _fake_get_job_status)
+        monkeypatch.setattr("genvoy.fal_client.asyncio.sleep", _record_sleep)
+        await client.wait_for_completion(
+            "fal-ai/flux/dev",
+            "req-3",
+            timeout_seconds=60,
+            poll_interval_seconds=2,
+        )
+    finally:
+        await client.aclose()
+
+    assert delays == [0.2, 0.2, 0.5, 0.5, 1.0, 2, 2]
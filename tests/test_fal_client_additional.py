@@ -7,6 +7,10 @@ import respx
 from genvoy.errors import GenvoyToolError
 from genvoy.fal_client import BASE_API, FalClient, QUEUE_API
 
+# Routes are relative to the platform API unless a test re-targets the queue host.
+pytestmark = pytest.mark.respx(base_url=BASE_API, assert_all_called=True)
+queue_routes = pytest.mark.respx(base_url=QUEUE_API, assert_all_called=True)
+
 
 # Expected behavior: constructor should fail immediately when FAL_KEY is missing.
 def test_fal_client_requires_key() -> None:
@@ -16,80 +20,131 @@ def test_fal_client_requires_key() -> None:
 
 
 # Expected behavior: HTTP 404 should map to MODEL_NOT_FOUND for actionable fallback guidance.
-@pytest.mark.asyncio
-async def test_request_maps_model_not_found() -> None:
-    client = FalClient("Key test")
-    try:
-        with respx.mock(assert_all_called=True) as mock:
-            mock.get(f"{BASE_API}/models").mock(return_value=httpx.Response(404, content=b"missing"))
-            with pytest.raises(GenvoyToolError) as exc:
-                await client.list_models()
-        assert exc.value.code == "MODEL_NOT_FOUND"
-    finally:
-        await client.aclose()
+async def test_request_maps_model_not_found(fal_client: FalClient, respx_mock: respx.MockRouter) -> None:
+    respx_mock.get("/models").mock(return_value=httpx.Response(404, content=b"missing"))
+    with pytest.raises(GenvoyToolError) as exc:
+        await fal_client.list_models()
+    assert exc.value.code == "MODEL_NOT_FOUND"
 
 
 # Expected behavior: non-special HTTP status failures should map to FAL_API_ERROR.
-@pytest.mark.asyncio
-async def test_request_maps_generic_http_failure() -> None:
-    client = FalClient("Key test")
-    try:
-        with respx.mock(assert_all_called=True) as mock:
-            mock.get(f"{BASE_API}/models").mock(return_value=httpx.Response(500, content=b"boom"))
-            with pytest.raises(GenvoyToolError) as exc:
-                await client.list_models()
-        assert exc.value.code == "FAL_API_ERROR"
-    finally:
-        await client.aclose()
+async def test_request_maps_generic_http_failure(fal_client: FalClient, respx_mock: respx.MockRouter) -> None:
+    respx_mock.get("/models").mock(return_value=httpx.Response(500, content=b"boom"))
+    with pytest.raises(GenvoyToolError) as exc:
+        await fal_client.list_models()
+    assert exc.value.code == "FAL_API_ERROR"
+    assert "500 response from fal.ai: boom" in str(exc.value)
+
+
+# Expected behavior: error previews should be capped at 500 bytes of the response body.
+async def test_request_truncates_large_error_body(fal_client: FalClient, respx_mock: respx.MockRouter) -> None:
+    respx_mock.get("/models").mock(return_value=httpx.Response(502, content=b"x" * 10_000))
+    with pytest.raises(GenvoyToolError) as exc:
+        await fal_client.list_models()
+    assert exc.value.message.endswith(": " + "x" * 500)
 
 
 # Expected behavior: get_schema should return inlined OpenAPI object from first model entry.
-@pytest.mark.asyncio
-async def test_get_schema_prefers_first_model_openapi() -> None:
-    client = FalClient("Key test")
-    try:
-        with respx.mock(assert_all_called=True) as mock:
-            mock.get(f"{BASE_API}/models").mock(
-                return_value=httpx.Response(
-                    200,
-                    json={"models": [{"openapi": {"title": "SchemaA"}}, {"openapi": {"title": "SchemaB"}}]},
-                )
-            )
-            payload = await client.get_schema("fal-ai/flux/dev")
-        assert payload["title"] == "SchemaA"
-    finally:
-        await client.aclose()
+async def test_get_schema_prefers_first_model_openapi(fal_client: FalClient, respx_mock: respx.MockRouter) -> None:
+    respx_mock.get("/models").mock(
+        return_value=httpx.Response(
+            200,
+            json={"models": [{"openapi": {"title": "SchemaA"}}, {"openapi": {"title": "SchemaB"}}]},
+        )
+    )
+    payload = await fal_client.get_schema("fal-ai/flux/dev")
+    assert payload["title"] == "SchemaA"
 
 
 # Expected behavior: estimate_cost should combine pricing and estimate endpoint payloads.
-@pytest.mark.asyncio
-async def test_estimate_cost_calls_pricing_and_estimate_endpoints() -> None:
-    client = FalClient("Key test")
-    try:
-        with respx.mock(assert_all_called=True) as mock:
-            mock.get(f"{BASE_API}/models/pricing").mock(return_value=httpx.Response(200, json={"unit_price": 0.02}))
-            mock.post(f"{BASE_API}/models/pricing/estimate").mock(
-                return_value=httpx.Response(200, json={"total_cost": 0.06})
-            )
-            payload = await client.estimate_cost("fal-ai/flux/dev", 3)
-        assert payload["pricing"]["unit_price"] == 0.02
-        assert payload["estimate"]["total_cost"] == 0.06
-    finally:
-        await client.aclose()
+async def test_estimate_cost_calls_pricing_and_estimate_endpoints(
+    fal_client: FalClient, respx_mock: respx.MockRouter
+) -> None:
+    respx_mock.get("/models/pricing").mock(return_value=httpx.Response(200, json={"unit_price": 0.02}))
+    respx_mock.post("/models/pricing/estimate").mock(return_value=httpx.Response(200, json={"total_cost": 0.06}))
+    payload = await fal_client.estimate_cost("fal-ai/flux/dev", 3)
+    assert payload["pricing"]["unit_price"] == 0.02
+    assert payload["estimate"]["total_cost"] == 0.06
 
 
 # Expected behavior: stream status should map unsupported stream endpoint responses to SSE_UNAVAILABLE.
-@pytest.mark.asyncio
-async def test_stream_job_status_maps_unavailable_status() -> None:
-    client = FalClient("Key test")
-    try:
-        with respx.mock(assert_all_called=True) as mock:
-            mock.get(f"{QUEUE_API}/fal-ai/flux/dev/requests/req-1/status/stream").mock(
-                return_value=httpx.Response(404, content=b"not found")
-            )
-            with pytest.raises(GenvoyToolError) as exc:
-                await client.stream_job_status("fal-ai/flux/dev", "req-1")
-        assert exc.value.code == "SSE_UNAVAILABLE"
-    finally:
-        await client.aclose()
+@queue_routes
+async def test_stream_job_status_maps_unavailable_status(fal_client: FalClient, respx_mock: respx.MockRouter) -> None:
+    respx_mock.get("/fal-ai/flux/dev/requests/req-1/status/stream").mock(
+        return_value=httpx.Response(404, content=b"not found")
+    )
+    with pytest.raises(GenvoyToolError) as exc:
+        await fal_client.stream_job_status("fal-ai/flux/dev", "req-1")
+    assert exc.value.code == "SSE_UNAVAILABLE"
+
+
+# Expected behavior: queue submission should layer the start-timeout header over auth and JSON defaults.
+@queue_routes
+async def test_submit_job_sends_start_timeout_header(fal_client: FalClient, respx_mock: respx.MockRouter) -> None:
+    route = respx_mock.post("/fal-ai/flux/dev").mock(return_value=httpx.Response(200, json={"request_id": "req-1"}))
+    await fal_client.submit_job("fal-ai/flux/dev", {"prompt": "x"})
+    await fal_client.submit_job("fal-ai/flux/dev", {"prompt": "x"}, start_timeout_seconds=15)
+    first, second = (call.request.headers for call in route.calls)
+    assert first["Authorization"] == "Key test"
+    assert first["X-Fal-Request-Timeout"] == "60"
+    assert second["Authorization"] == "Key test"
+    assert second["X-Fal-Request-Timeout"] == "15"
+    assert second["Accept"] == "application/json"
+
+
+class _RecordingClient:
+    def __init__(self) -> None:
+        self.sent_headers: list[dict[str, str]] = []
+
+    async def request(self, method: str, url: str, *, headers: dict[str, str], **kwargs: object) -> httpx.Response:
+        self.sent_headers.append(headers)
+        return httpx.Response(200, json={"request_id": "req-1"}, request=httpx.Request(method, url))
+
+
+# Expected behavior: default-timeout submissions should pass one prebuilt header dict instead of re-merging.
+async def test_submit_job_reuses_prebuilt_default_headers() -> None:
+    recorder = _RecordingClient()
+    client = FalClient("Key test", client=recorder)  # type: ignore[arg-type]
+    await client.submit_job("fal-ai/flux/dev", {"prompt": "x"})
+    await client.submit_job("fal-ai/flux/dev", {"prompt": "y"})
+    first, second = recorder.sent_headers
+    assert first is second
+    assert first == {**client.headers, "X-Fal-Request-Timeout": "60"}
+
+
+# Expected behavior: multi-line `data:` fields should be joined into one JSON event before parsing.
+@queue_routes
+async def test_stream_job_status_joins_multiline_data_events(
+    fal_client: FalClient, respx_mock: respx.MockRouter
+) -> None:
+    respx_mock.get("/fal-ai/flux/dev/requests/req-1/status/stream").mock(
+        return_value=httpx.Response(
+            200,
+            headers={"Content-Type": "text/event-stream"},
+            content=b'data: {"status":\r\ndata: "COMPLETED"}\r\n\r\n',
+        )
+    )
+    terminal = await fal_client.stream_job_status("fal-ai/flux/dev", "req-1")
+    assert terminal == {"status": "COMPLETED"}
+
+
+# Expected behavior: a bare carriage return should end SSE lines just like \n and \r\n.
+@queue_routes
+async def test_stream_job_status_accepts_cr_line_endings(fal_client: FalClient, respx_mock: respx.MockRouter) -> None:
+    respx_mock.get("/fal-ai/flux/dev/requests/req-1/status/stream").mock(
+        return_value=httpx.Response(
+            200,
+            headers={"Content-Type": "text/event-stream"},
+            content=b'data: {"status":"IN_PROGRESS"}\r\rdata: {"status":"COMPLETED"}\r\r',
+        )
+    )
+    terminal = await fal_client.stream_job_status("fal-ai/flux/dev", "req-1")
+    assert terminal == {"status": "COMPLETED"}
+
 
+# Expected behavior: status extraction should prefer nested `data` fields and fall back to top-level keys.
+def test_status_value_prefers_nested_data_then_top_level() -> None:
+    assert FalClient._status_value({"data": {"status": "completed"}, "status": "IN_QUEUE"}) == "COMPLETED"
+    assert FalClient._status_value({"data": {"progress": 5}, "state": "in_progress"}) == "IN_PROGRESS"
+    assert FalClient._status_value({"status": "failed"}) == "FAILED"
+    assert FalClient._status_value({}) == ""
@@ -1,28 +1,27 @@
 from __future__ import annotations
 
+import asyncio
+import errno
+import os
+from collections.abc import AsyncIterator
 from pathlib import Path
-import shutil
-import uuid
 
 import httpx
 import pytest
 import respx
 
+import genvoy.filesystem as filesystem
 from genvoy.errors import GenvoyToolError
 from genvoy.filesystem import (
+    copy_to_repo,
     detect_type_and_ext,
     download_to_file,
     ensure_safe_path,
+    reset_path_cache,
     unique_path,
 )
 
-
-def _workspace_tmp_dir() -> Path:
-    base = Path.cwd() / ".pytest_codex_tmp"
-    base.mkdir(parents=True, exist_ok=True)
-    path = base / f"fs-{uuid.uuid4().hex[:8]}"
-    path.mkdir(parents=True, exist_ok=False)
-    return path
+pytestmark = pytest.mark.respx(assert_all_called=True)
 
 
 # Expected behavior: known URL extension should determine media type without content-type fallback.
@@ -39,67 +38,264 @@ def test_detect_type_and_ext_from_content_type_fallback() -> None:
     assert ext == ".png"
 
 
+# Expected behavior: dots in parent URL segments should not be mistaken for a file extension.
+def test_detect_type_and_ext_ignores_dotted_directories() -> None:
+    media_type, ext = detect_type_and_ext("https://cdn.fal.ai/v1.2/files/noext")
+    assert media_type == "unknown"
+    assert ext is None
+
+
+# Expected behavior: distinct URLs sharing a suffix should be served from the memo cache.
+def test_detect_type_and_ext_memoizes_by_suffix() -> None:
+    assert detect_type_and_ext("https://cdn.fal.ai/file/req-1.webp") == ("image", ".webp")
+    before = filesystem._detect_cached.cache_info().hits
+    assert detect_type_and_ext("https://cdn.fal.ai/file/req-2.WEBP?token=abc") == ("image", ".webp")
+    assert filesystem._detect_cached.cache_info().hits == before + 1
+
+
 # Expected behavior: paths resolving outside working directory should be blocked.
-def test_ensure_safe_path_blocks_path_traversal() -> None:
-    tmp = _workspace_tmp_dir()
-    try:
-        root = tmp / "root"
-        root.mkdir()
-        outside = tmp / "outside.txt"
-        outside.touch()
-        with pytest.raises(GenvoyToolError) as exc:
-            ensure_safe_path(outside, cwd=root)
-        assert exc.value.code == "PATH_TRAVERSAL_BLOCKED"
-    finally:
-        shutil.rmtree(tmp, ignore_errors=True)
+def test_ensure_safe_path_blocks_path_traversal(tmp_path: Path) -> None:
+    root = tmp_path / "root"
+    root.mkdir()
+    outside = tmp_path / "outside.txt"
+    outside.touch()
+    with pytest.raises(GenvoyToolError) as exc:
+        ensure_safe_path(outside, cwd=root)
+    assert exc.value.code == "PATH_TRAVERSAL_BLOCKED"
+
+
+# Expected behavior: a symlinked target should be rejected even when it points inside the root.
+def test_ensure_safe_path_rejects_symlink(tmp_path: Path) -> None:
+    real = tmp_path / "real.png"
+    real.touch()
+    link = tmp_path / "link.png"
+    link.symlink_to(real)
+    with pytest.raises(GenvoyToolError) as exc:
+        ensure_safe_path(link, cwd=tmp_path)
+    assert exc.value.code == "PATH_TRAVERSAL_BLOCKED"
+    assert ensure_safe_path(real, cwd=tmp_path) == real.resolve()
 
 
 # Expected behavior: filename collisions should produce deterministic auto-incremented names.
-def test_unique_path_auto_increments() -> None:
-    tmp = _workspace_tmp_dir()
-    try:
-        first = tmp / "hero.png"
-        first.write_bytes(b"x")
-        second = unique_path(first)
-        assert second.name == "hero_1.png"
-    finally:
-        shutil.rmtree(tmp, ignore_errors=True)
+def test_unique_path_auto_increments(tmp_path: Path) -> None:
+    first = tmp_path / "hero.png"
+    first.write_bytes(b"x")
+    second = unique_path(first)
+    assert second.name == "hero_1.png"
+
+
+# Expected behavior: collisions should continue after the highest existing numeric suffix.
+def test_unique_path_skips_past_highest_existing_suffix(tmp_path: Path) -> None:
+    for name in ("hero.png", "hero_1.png", "hero_3.png", "hero_9.jpg", "other_7.png"):
+        (tmp_path / name).write_bytes(b"x")
+    assert unique_path(tmp_path / "hero.png").name == "hero_4.png"
+
+
+# Expected behavior: suffixes taken under a different letter case should not be reused.
+def test_unique_path_ignores_case_when_scanning(tmp_path: Path) -> None:
+    for name in ("hero.png", "hero_1.PNG"):
+        (tmp_path / name).write_bytes(b"x")
+    assert unique_path(tmp_path / "hero.png").name == "hero_2.png"
 
 
 # Expected behavior: successful CDN download should write bytes to disk and infer extension when missing.
-@pytest.mark.asyncio
-async def test_download_to_file_success() -> None:
-    tmp = _workspace_tmp_dir()
+async def test_download_to_file_success(
+    monkeypatch: pytest.MonkeyPatch,
+    respx_mock: respx.MockRouter,
+    tmp_path: Path,
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    url = "https://cdn.fal.ai/artifact/abc"
+    respx_mock.get(url).mock(
+        return_value=httpx.Response(
+            200,
+            headers={"Content-Type": "image/png"},
+            content=b"PNGDATA",
+        )
+    )
+    result = await download_to_file(url, tmp_path / "result")
+
+    assert result.path.exists()
+    assert result.path.suffix == ".png"
+    assert result.media_type == "image"
+    assert result.file_size_bytes == len(b"PNGDATA")
+
+
+# Expected behavior: bodies spanning several chunks and write batches should land on disk intact.
+async def test_download_to_file_batches_multi_chunk_body(
+    monkeypatch: pytest.MonkeyPatch,
+    respx_mock: respx.MockRouter,
+    tmp_path: Path,
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(filesystem, "DOWNLOAD_CHUNK_SIZE", 3)
+    monkeypatch.setattr(filesystem, "WRITE_BATCH_BYTES", 7)
+    body = bytes(range(256)) * 4
+    url = "https://cdn.fal.ai/artifact/large.mp4"
+    respx_mock.get(url).mock(return_value=httpx.Response(200, content=body))
+    result = await download_to_file(url, tmp_path / "clip")
+
+    assert result.path.suffix == ".mp4"
+    assert result.file_size_bytes == len(body)
+    assert result.path.read_bytes() == body
+
+
+# Expected behavior: a download cancelled mid-stream should leave no partial file behind.
+async def test_download_to_file_cancelled_mid_stream_removes_partial_file(
+    monkeypatch: pytest.MonkeyPatch,
+    respx_mock: respx.MockRouter,
+    tmp_path: Path,
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(filesystem, "DOWNLOAD_CHUNK_SIZE", 3)
+    monkeypatch.setattr(filesystem, "WRITE_BATCH_BYTES", 4)
+    first_batch_written = asyncio.Event()
+
+    async def _stalling_body() -> AsyncIterator[bytes]:
+        yield b"PNGDATA"
+        first_batch_written.set()
+        await asyncio.Event().wait()
+
+    url = "https://cdn.fal.ai/artifact/stalled.png"
+    respx_mock.get(url).mock(return_value=httpx.Response(200, content=_stalling_body()))
+    download = asyncio.create_task(download_to_file(url, tmp_path / "stalled.png"))
+    await asyncio.wait_for(first_batch_written.wait(), timeout=1.0)
+    assert (tmp_path / "stalled.png").exists()
+    download.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await download
+
+    assert not (tmp_path / "stalled.png").exists()
+
+
+# Expected behavior: transient transport errors should be retried with jittered backoff on the shared client.
+async def test_download_to_file_retries_transient_errors_with_jitter(
+    monkeypatch: pytest.MonkeyPatch,
+    respx_mock: respx.MockRouter,
+    tmp_path: Path,
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    delays: list[float] = []
+
+    async def _record_sleep(delay: float) -> None:
+        delays.append(delay)
+
+    monkeypatch.setattr(filesystem.asyncio, "sleep", _record_sleep)
+    url = "https://cdn.fal.ai/artifact/flaky.png"
+    route = respx_mock.get(url).mock(
+        side_effect=[
+            httpx.ConnectError("reset"),
+            httpx.ConnectError("reset"),
+            httpx.Response(200, content=b"PNGDATA"),
+        ]
+    )
+    result = await download_to_file(url, tmp_path / "flaky")
+
+    assert route.call_count == 3
+    assert result.file_size_bytes == len(b"PNGDATA")
+    assert len(delays) == 2
+    assert 0.375 <= delays[0] <= 0.625
+    assert 0.75 <= delays[1] <= 1.25
+
+
+# Expected behavior: CDN 403/404 responses should be surfaced as CDN_EXPIRED tool errors.
+async def test_download_to_file_cdn_expired(respx_mock: respx.MockRouter, tmp_path: Path) -> None:
+    url = "https://cdn.fal.ai/artifact/expired"
+    respx_mock.get(url).mock(return_value=httpx.Response(404, content=b"missing"))
+    with pytest.raises(GenvoyToolError) as exc:
+        await download_to_file(url, tmp_path / "result.png")
+    assert exc.value.code == "CDN_EXPIRED"
+
+
+# Expected behavior: the cached root should follow working-directory changes instead of pinning the first cwd.
+def test_ensure_safe_path_tracks_cwd_changes(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
     try:
-        url = "https://cdn.fal.ai/artifact/abc"
-        with respx.mock(assert_all_called=True) as mock:
-            mock.get(url).mock(
-                return_value=httpx.Response(
-                    200,
-                    headers={"Content-Type": "image/png"},
-                    content=b"PNGDATA",
-                )
-            )
-            result = await download_to_file(url, tmp / "result")
-
-        assert result.path.exists()
-        assert result.path.suffix == ".png"
-        assert result.media_type == "image"
-        assert result.file_size_bytes == len(b"PNGDATA")
+        first = tmp_path / "first"
+        second = tmp_path / "second"
+        first.mkdir()
+        second.mkdir()
+        monkeypatch.chdir(first)
+        assert ensure_safe_path(first / "a.png") == (first / "a.png").resolve()
+        monkeypatch.chdir(second)
+        with pytest.raises(GenvoyToolError) as exc:
+            ensure_safe_path(first / "a.png")
+        assert exc.value.code == "PATH_TRAVERSAL_BLOCKED"
     finally:
-        shutil.rmtree(tmp, ignore_errors=True)
+        reset_path_cache()
 
 
-# Expected behavior: CDN 403/404 responses should be surfaced as CDN_EXPIRED tool errors.
-@pytest.mark.asyncio
-async def test_download_to_file_cdn_expired() -> None:
-    tmp = _workspace_tmp_dir()
+# Expected behavior: a relative cwd should be re-anchored after chdir rather than reuse a stale cached root.
+def test_ensure_safe_path_relative_cwd_follows_chdir(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
     try:
-        url = "https://cdn.fal.ai/artifact/expired"
-        with respx.mock(assert_all_called=True) as mock:
-            mock.get(url).mock(return_value=httpx.Response(404, content=b"missing"))
-            with pytest.raises(GenvoyToolError) as exc:
-                await download_to_file(url, tmp / "result.png")
-        assert exc.value.code == "CDN_EXPIRED"
+        first = tmp_path / "first"
+        second = tmp_path / "second"
+        first.mkdir()
+        second.mkdir()
+        monkeypatch.chdir(first)
+        assert ensure_safe_path(first / "a.png", cwd=Path(".")) == (first / "a.png").resolve()
+        monkeypatch.chdir(second)
+        with pytest.raises(GenvoyToolError) as exc:
+            ensure_safe_path(first / "a.png", cwd=Path("."))
+        assert exc.value.code == "PATH_TRAVERSAL_BLOCKED"
     finally:
-        shutil.rmtree(tmp, ignore_errors=True)
+        reset_path_cache()
+
+
+# Expected behavior: repo copies should duplicate bytes and preserve source metadata such as mtime.
+async def test_copy_to_repo_copies_bytes_and_metadata(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.chdir(tmp_path)
+    src = tmp_path / "source.mp4"
+    src.write_bytes(b"VIDEO" * 1000)
+    os.utime(src, (1_700_000_000, 1_700_000_000))
+    target = await copy_to_repo(src, tmp_path / "repo" / "clip.mp4")
+
+    assert target.read_bytes() == src.read_bytes()
+    assert target.stat().st_mtime == pytest.approx(src.stat().st_mtime)
+
+
+# Expected behavior: cross-device copies should fall back from copy_file_range to sendfile.
+async def test_copy_to_repo_uses_sendfile_when_copy_file_range_crosses_devices(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    sendfile_calls: list[int] = []
+    real_sendfile = os.sendfile
+
+    def _cross_device(*args, **kwargs):
+        raise OSError(errno.EXDEV, "cross-device link")
+
+    def _tracking_sendfile(out_fd: int, in_fd: int, offset: int, count: int) -> int:
+        sendfile_calls.append(offset)
+        return real_sendfile(out_fd, in_fd, offset, count)
+
+    monkeypatch.setattr(filesystem.os, "copy_file_range", _cross_device, raising=False)
+    monkeypatch.setattr(filesystem.os, "sendfile", _tracking_sendfile)
+    src = tmp_path / "source.mp4"
+    src.write_bytes(b"VIDEO" * 1000)
+    target = await copy_to_repo(src, tmp_path / "repo" / "clip.mp4")
+
+    assert target.read_bytes() == src.read_bytes()
+    assert sendfile_calls and sendfile_calls[0] == 0
+
+
+# Expected behavior: platforms where neither kernel copy can target files should fall back to a regular copy.
+async def test_copy_to_repo_falls_back_when_sendfile_unsupported(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    monkeypatch.chdir(tmp_path)
+
+    def _unsupported(*args, **kwargs):
+        raise OSError(errno.ENOTSOCK, "not a socket")
+
+    def _cross_device(*args, **kwargs):
+        raise OSError(errno.EXDEV, "cross-device link")
+
+    monkeypatch.setattr(filesystem.os, "copy_file_range", _cross_device, raising=False)
+    monkeypatch.setattr(filesystem.os, "sendfile", _unsupported, raising=False)
+    src = tmp_path / "source.png"
+    src.write_bytes(b"PNGDATA")
+    target = await copy_to_repo(src, tmp_path / "repo" / "hero.png")
+
+    assert target.read_bytes() == b"PNGDATA"
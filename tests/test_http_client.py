@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+
+from genvoy.fal_client import FalClient
+from genvoy.http_client import close_shared_client, get_shared_client
+
+
+# Expected behavior: repeated lookups should return the same pooled client instance.
+def test_get_shared_client_returns_singleton() -> None:
+    assert get_shared_client() is get_shared_client()
+
+
+# Expected behavior: closing the shared client should make the next lookup build a fresh pool.
+async def test_close_shared_client_recreates_on_next_use() -> None:
+    first = get_shared_client()
+    await close_shared_client()
+    assert first.is_closed
+    second = get_shared_client()
+    assert second is not first
+    assert not second.is_closed
+
+
+# Expected behavior: FalClient instances should reuse the pooled client and leave it open on close.
+async def test_fal_clients_share_pool_and_do_not_close_it() -> None:
+    first = FalClient("Key a")
+    second = FalClient("Key b")
+    assert first.client is second.client is get_shared_client()
+    await first.aclose()
+    assert not second.client.is_closed
+
+
+# Expected behavior: a FalClient built before the pool is recycled should pick up the fresh pool.
+async def test_fal_client_follows_recycled_pool() -> None:
+    fal = FalClient("Key a")
+    first = fal.client
+    await close_shared_client()
+    assert fal.client is get_shared_client()
+    assert fal.client is not first
+
+
+# Expected behavior: each event loop should get its own pool instead of reusing one bound to a closed loop.
+def test_shared_client_is_rebuilt_for_a_new_event_loop() -> None:
+    async def _use_once() -> httpx.AsyncClient:
+        async with FalClient("Key a") as fal:
+            return fal.client
+
+    first = asyncio.run(_use_once())
+    second = asyncio.run(_use_once())
+    assert second is not first
+    assert not second.is_closed
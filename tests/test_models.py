@@ -6,6 +6,9 @@ from pydantic import ValidationError
 from genvoy import config
 from genvoy.models import BatchInput, CompareInput, GenerateInput
 
+_MAX_PROMPT = "x" * config.MAX_PROMPT_LENGTH
+_OVER_PROMPT = _MAX_PROMPT + "x"
+
 
 # Expected behavior: valid generation input should parse successfully with defaults.
 def test_generate_input_accepts_valid_payload() -> None:
@@ -33,7 +36,7 @@ def test_generate_input_rejects_invalid_model_id() -> None:
 def test_prompt_length_allows_exact_boundary() -> None:
     model = GenerateInput(
         model_id="fal-ai/flux/dev",
-        prompt="x" * config.MAX_PROMPT_LENGTH,
+        prompt=_MAX_PROMPT,
         output_path="./out/file",
     )
     assert len(model.prompt) == config.MAX_PROMPT_LENGTH
@@ -44,7 +47,7 @@ def test_prompt_length_rejects_above_boundary() -> None:
     with pytest.raises(ValidationError) as exc:
         GenerateInput(
             model_id="fal-ai/flux/dev",
-            prompt="x" * (config.MAX_PROMPT_LENGTH + 1),
+            prompt=_OVER_PROMPT,
             output_path="./out/file",
         )
     assert "PROMPT_TOO_LONG" in str(exc.value)
@@ -71,3 +74,30 @@ def test_compare_input_accepts_max_model_count_boundary() -> None:
     )
     assert len(payload.model_ids) == config.MAX_COMPARE_MODELS
 
+
+# Expected behavior: model IDs must match the whole string, including rejecting a trailing newline.
+def test_generate_input_rejects_model_id_with_trailing_newline() -> None:
+    with pytest.raises(ValidationError) as exc:
+        GenerateInput(
+            model_id="fal-ai/flux/dev\n",
+            prompt="hello",
+            output_path="./out/file",
+        )
+    assert "INVALID_MODEL_ID" in str(exc.value)
+
+
+# Expected behavior: repeated compare model IDs should be preserved while an invalid entry is still rejected.
+def test_compare_input_validates_repeated_ids_once() -> None:
+    payload = CompareInput(
+        model_ids=["fal-ai/flux/dev", "fal-ai/flux/dev"],
+        prompt="compare prompt",
+        output_dir="./out",
+    )
+    assert payload.model_ids == ["fal-ai/flux/dev", "fal-ai/flux/dev"]
+    with pytest.raises(ValidationError) as exc:
+        CompareInput(
+            model_ids=["fal-ai/flux/dev", "fal-ai/flux/dev", "bad id"],
+            prompt="compare prompt",
+            output_dir="./out",
+        )
+    assert "INVALID_MODEL_ID" in str(exc.value)
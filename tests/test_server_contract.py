@@ -1,4 +1,8 @@
 from __future__ import annotations
+
+import json
+import sys
+import types
 from pathlib import Path
 
 import pytest
@@ -6,17 +10,8 @@ from fastmcp.server.transforms import ResourcesAsTools
 
 import genvoy.server as server
 
-
-# Expected behavior: MCP server must register 8 core tools plus resource bridge tools from ResourcesAsTools.
-@pytest.mark.asyncio
-async def test_mcp_registration_contract() -> None:
-    tools = await server.mcp.list_tools()
-    resources = await server.mcp.list_resources()
-
-    tool_names = {tool.name for tool in tools}
-    resource_uris = {str(resource.uri) for resource in resources}
-
-    assert tool_names == {
+_EXPECTED_TOOLS = frozenset(
+    {
         "search_models",
         "get_schema",
         "estimate_cost",
@@ -28,7 +23,26 @@ async def test_mcp_registration_contract() -> None:
         "list_resources",
         "read_resource",
     }
-    assert resource_uris == {"genvoy://models", "genvoy://recent"}
+)
+_EXPECTED_RESOURCES = frozenset({"genvoy://models", "genvoy://recent"})
+
+
+@pytest.fixture(scope="session")
+def server_source() -> str:
+    # Resolved from the module rather than the cwd, which some filesystem tests move.
+    return Path(server.__file__).read_text(encoding="utf-8")
+
+
+# Expected behavior: MCP server must register 8 core tools plus resource bridge tools from ResourcesAsTools.
+async def test_mcp_registration_contract() -> None:
+    tools = await server.mcp.list_tools()
+    resources = await server.mcp.list_resources()
+
+    tool_names = frozenset(tool.name for tool in tools)
+    resource_uris = frozenset(str(resource.uri) for resource in resources)
+
+    assert tool_names == _EXPECTED_TOOLS, tool_names.symmetric_difference(_EXPECTED_TOOLS)
+    assert resource_uris == _EXPECTED_RESOURCES, resource_uris.symmetric_difference(_EXPECTED_RESOURCES)
 
 
 # Expected behavior: server should enable ResourcesAsTools compatibility transform for clients without resource support.
@@ -37,6 +51,7 @@ def test_server_enables_resources_as_tools_transform() -> None:
 
 
 # Expected behavior: startup should fail fast before server run if FAL_KEY is missing.
+@pytest.mark.xdist_group("server_state")
 def test_main_fails_fast_without_fal_key(monkeypatch: pytest.MonkeyPatch) -> None:
     run_called = False
 
@@ -53,6 +68,7 @@ def test_main_fails_fast_without_fal_key(monkeypatch: pytest.MonkeyPatch) -> Non
 
 
 # Expected behavior: startup should call MCP run when FAL_KEY is present.
+@pytest.mark.xdist_group("server_state")
 def test_main_starts_when_fal_key_present(monkeypatch: pytest.MonkeyPatch) -> None:
     run_called = False
 
@@ -62,26 +78,71 @@ def test_main_starts_when_fal_key_present(monkeypatch: pytest.MonkeyPatch) -> No
 
     monkeypatch.setenv("FAL_KEY", "abc123")
     monkeypatch.setattr(server.mcp, "run", _fake_run)
+    monkeypatch.setattr(server, "_install_uvloop", lambda: False)
 
     server.main()
     assert run_called is True
 
 
+# Expected behavior: uvloop should be installed as the loop policy when importable, and skipped when absent.
+def test_install_uvloop_is_optional(monkeypatch: pytest.MonkeyPatch) -> None:
+    installed: list[object] = []
+    sentinel = object()
+    fake_uvloop = types.SimpleNamespace(EventLoopPolicy=lambda: sentinel)
+    monkeypatch.setattr(server.asyncio, "set_event_loop_policy", installed.append)
+    monkeypatch.setattr(server.sys, "platform", "linux")
+
+    monkeypatch.setitem(sys.modules, "uvloop", fake_uvloop)
+    assert server._install_uvloop() is True
+    assert installed == [sentinel]
+
+    monkeypatch.setitem(sys.modules, "uvloop", None)
+    assert server._install_uvloop() is False
+    assert installed == [sentinel]
+
+
+# Expected behavior: models resource reads within the TTL should reuse the encoded snapshot, then refetch.
+async def test_models_resource_caches_snapshot_for_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
+    class _FakeClient:
+        def __init__(self) -> None:
+            self.list_calls = 0
+
+        async def list_models(self):
+            self.list_calls += 1
+            return {"models": [{"endpoint_id": f"fal-ai/model-{self.list_calls}"}]}
+
+    client = _FakeClient()
+
+    async def _fake_get_client():
+        return client
+
+    monkeypatch.setattr(server, "_get_client", _fake_get_client)
+    monkeypatch.setattr(server, "_MODELS_RESOURCE_CACHE", None)
+
+    first = await server.models_resource()
+    assert await server.models_resource() is first
+    assert client.list_calls == 1
+
+    # Age the snapshot past its expiry instead of patching the clock the event loop also reads.
+    monkeypatch.setattr(server, "_MODELS_RESOURCE_CACHE", (client, 0.0, first))
+    refreshed = await server.models_resource()
+    assert client.list_calls == 2
+    assert "fal-ai/model-2" in refreshed
+
+
 # Expected behavior: server source should not use print(), preserving stdout for MCP JSON-RPC only.
-def test_server_source_avoids_print_statements() -> None:
-    source = Path("genvoy/server.py").read_text(encoding="utf-8")
-    assert "print(" not in source
+def test_server_source_avoids_print_statements(server_source: str) -> None:
+    assert "print(" not in server_source
 
 
 # Expected behavior: resource methods should return JSON string payloads when client calls succeed.
-@pytest.mark.asyncio
 async def test_resource_methods_return_json_strings(monkeypatch: pytest.MonkeyPatch) -> None:
     class _FakeClient:
         async def list_models(self):
             return {"models": [{"endpoint_id": "fal-ai/flux/dev"}]}
 
         async def list_recent(self):
-            return {"usage": []}
+            return {"usage": [{"prompt": "café — 日本"}]}
 
         async def aclose(self):
             return None
@@ -95,3 +156,8 @@ async def test_resource_methods_return_json_strings(monkeypatch: pytest.MonkeyPa
 
     assert '"models"' in models_payload
     assert '"usage"' in recent_payload
+    assert json.loads(models_payload) == {"models": [{"endpoint_id": "fal-ai/flux/dev"}]}
+    assert models_payload == json.dumps(json.loads(models_payload), indent=2)
+    # Non-ASCII text is emitted as raw UTF-8 rather than json.dumps' default \u escapes.
+    assert "café — 日本" in recent_payload
+    assert recent_payload == json.dumps({"usage": [{"prompt": "café — 日本"}]}, indent=2, ensure_ascii=False)
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
+import asyncio
 import re
-import shutil
-import uuid
+from collections import deque
 from pathlib import Path
 from typing import Any
 
@@ -11,172 +11,409 @@ import pytest
 import respx
 
 import genvoy.server as server
+from genvoy.concurrency import AdmissionGate
 from genvoy.errors import GenvoyToolError
 
-
-def _workspace_tmp_dir() -> Path:
-    base = Path.cwd() / ".pytest_codex_tmp"
-    base.mkdir(parents=True, exist_ok=True)
-    path = base / f"srv-{uuid.uuid4().hex[:8]}"
-    path.mkdir(parents=True, exist_ok=False)
-    return path
+_CDN_URL = re.compile(r"https://cdn\.fal\.ai/.*")
+# Shared across fake jobs; the server only reads status payloads, never mutates them.
+_IN_PROGRESS_STATUS = {"status": "IN_PROGRESS", "progress": 0.5}
+_TERMINAL_STATUS = {"status": "COMPLETED", "usage": {"cost_usd": 0.42}, "timings": {"duration_ms": 1234}}
 
 
 class _Ctx:
     def __init__(self) -> None:
-        self.progress_events: list[tuple[float, float | None, str | None]] = []
+        # Bounded so long polling loops don't grow the recorder; assertions only need recent events.
+        self.progress_events: deque[tuple[float, float | None, str | None]] = deque(maxlen=16)
 
     async def report_progress(self, progress: float, total: float | None = None, message: str | None = None) -> None:
         self.progress_events.append((progress, total, message))
 
 
 class _ClientFactory:
-    def __init__(self, *, fail_request_ids: set[str] | None = None, fail_models: set[str] | None = None):
+    def __init__(
+        self,
+        *,
+        fail_request_ids: set[str] | None = None,
+        fail_models: set[str] | None = None,
+        hang_request_ids: set[str] | None = None,
+    ):
         self.counter = 0
         self.fail_request_ids = fail_request_ids or set()
+        self.hang_request_ids = hang_request_ids or set()
         self.fail_models = fail_models or set()
         self.closed_clients = 0
-
-    def make(self):
-        factory = self
-
-        class _FakeClient:
-            async def submit_job(self, model_id: str, payload: dict[str, Any]) -> dict[str, Any]:
-                factory.counter += 1
-                return {"request_id": f"req-{factory.counter}"}
-
-            async def wait_for_completion(
-                self,
-                model_id: str,
-                request_id: str,
-                timeout_seconds: float = 360.0,
-                poll_interval_seconds: float = 2.0,
-                on_status=None,
-            ) -> dict[str, Any]:
-                if on_status:
-                    await on_status({"status": "IN_PROGRESS", "progress": 0.5})
-                if request_id in factory.fail_request_ids or model_id in factory.fail_models:
-                    raise GenvoyToolError("JOB_FAILED", f"forced failure for {model_id}/{request_id}")
-                terminal = {"status": "COMPLETED", "usage": {"cost_usd": 0.42}, "timings": {"duration_ms": 1234}}
-                if on_status:
-                    await on_status(terminal)
-                return terminal
-
-            async def get_job_result(self, model_id: str, request_id: str) -> dict[str, Any]:
-                return {
-                    "result": {
-                        "url": f"https://cdn.fal.ai/{model_id.replace('/', '-')}-{request_id}.png",
-                    },
-                    "usage": {"cost": "$0.15"},
-                }
-
-            async def aclose(self) -> None:
-                factory.closed_clients += 1
-
-        return _FakeClient()
+        self.hang_submits: set[int] = set()
+        self.delays: dict[str, float] = {}
+        self.cancel_request_ids: set[str] = set()
+        self.running = 0
+        self.peak_running = 0
+        self.cancelled_request_ids: list[str] = []
+        self.poll_intervals: list[float] = []
+        self.wait_timeouts: list[float] = []
+        self.client = _FakeClient(self)
+
+    def make(self) -> _FakeClient:
+        return self.client
+
+
+class _FakeClient:
+    fal_key = "Key client"
+
+    def __init__(self, factory: _ClientFactory):
+        self._factory = factory
+
+    async def submit_job(self, model_id: str, payload: dict[str, Any]) -> dict[str, Any]:
+        self._factory.counter += 1
+        if self._factory.counter in self._factory.hang_submits:
+            await asyncio.sleep(60)
+        self._factory.running += 1
+        self._factory.peak_running = max(self._factory.peak_running, self._factory.running)
+        return {"request_id": f"req-{self._factory.counter}"}
+
+    async def wait_for_completion(
+        self,
+        model_id: str,
+        request_id: str,
+        timeout_seconds: float = 360.0,
+        poll_interval_seconds: float = 2.0,
+        on_status=None,
+    ) -> dict[str, Any]:
+        self._factory.poll_intervals.append(poll_interval_seconds)
+        self._factory.wait_timeouts.append(timeout_seconds)
+        if on_status:
+            await on_status(_IN_PROGRESS_STATUS)
+        if request_id in self._factory.hang_request_ids:
+            await asyncio.sleep(60)
+        await asyncio.sleep(self._factory.delays.get(request_id, 0))
+        if request_id in self._factory.cancel_request_ids:
+            raise asyncio.CancelledError()
+        if request_id in self._factory.fail_request_ids or model_id in self._factory.fail_models:
+            raise GenvoyToolError("JOB_FAILED", f"forced failure for {model_id}/{request_id}")
+        if on_status:
+            await on_status(_TERMINAL_STATUS)
+        return _TERMINAL_STATUS
+
+    async def get_job_result(self, model_id: str, request_id: str) -> dict[str, Any]:
+        self._factory.running -= 1
+        return {
+            "result": {
+                "url": f"https://cdn.fal.ai/{model_id.replace('/', '-')}-{request_id}.png",
+            },
+            "usage": {"cost": "$0.15"},
+        }
+
+    async def cancel_job(self, model_id: str, request_id: str) -> dict[str, Any]:
+        self._factory.running -= 1
+        self._factory.cancelled_request_ids.append(request_id)
+        return {"status": "CANCELLATION_REQUESTED"}
+
+    async def aclose(self) -> None:
+        self._factory.closed_clients += 1
+
+
+@pytest.fixture
+def factory(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> _ClientFactory:
+    # Generation tools resolve output paths against the working directory, so run inside tmp_path.
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("FAL_KEY", "Key test")
+    factory = _ClientFactory()
+
+    async def _fake_get_client():
+        return factory.make()
+
+    monkeypatch.setattr(server, "_get_client", _fake_get_client)
+    return factory
+
+
+@pytest.fixture
+def cdn(respx_mock: respx.MockRouter) -> respx.Route:
+    return respx_mock.get(_CDN_URL).mock(
+        return_value=httpx.Response(200, headers={"Content-Type": "image/png"}, content=b"IMG")
+    )
+
+
+# Expected behavior: media URL extraction should prefer recognised media extensions, then the first URL seen.
+def test_extract_first_media_url_prefers_media_extension() -> None:
+    payload = {
+        "metadata": {"docs": "https://fal.ai/docs"},
+        "images": [{"url": "https://cdn.fal.ai/no-extension"}, {"url": "https://cdn.fal.ai/hero.png"}],
+        "video": {"url": "https://cdn.fal.ai/clip.mp4"},
+    }
+    assert server._extract_first_media_url(payload) == "https://cdn.fal.ai/hero.png"
+    assert server._extract_first_media_url({"result": ["https://cdn.fal.ai/a", "https://cdn.fal.ai/b"]}) == (
+        "https://cdn.fal.ai/a"
+    )
+    assert server._extract_first_media_url({"status": "COMPLETED"}) is None
+
+
+# Expected behavior: metric extraction should prefer top-level paths over `data`, parse cost strings, and skip bad durations.
+def test_extract_metrics_single_pass_precedence() -> None:
+    payload = {
+        "usage": {"cost": "$0.15 USD"},
+        "timings": {"duration_ms": "n/a"},
+        "data": {"cost_usd": 9.0, "metrics": {"duration_ms": 1234.7}},
+    }
+    assert server._extract_metrics(payload) == (0.15, 1234)
+    assert server._extract_metrics({"data": {"cost": 2}, "metrics": "flat"}) == (2.0, None)
+    assert server._extract_metrics({}) == (None, None)
+
+
+# Expected behavior: status should prefer nested `data` fields, and progress should read only the innermost source.
+def test_status_and_progress_share_normalized_sources() -> None:
+    wrapped = server._sources({"status": "in_queue", "data": {"state": "in_progress", "progress": 0.25}})
+    assert server._status_from_sources(wrapped) == "IN_PROGRESS"
+    assert server._progress_from_sources(wrapped) == 25.0
+
+    flat = server._sources({"state": "completed", "data": "not-a-dict", "metrics": {"progress": 40}})
+    assert flat == ({"state": "completed", "data": "not-a-dict", "metrics": {"progress": 40}},)
+    assert server._status_from_sources(flat) == "COMPLETED"
+    assert server._progress_from_sources(flat) == 40.0
+    assert server._status_from_sources(server._sources({"data": {}})) == ""
+
+
+# Expected behavior: repeated heartbeat statuses should not produce duplicate progress notifications.
+async def test_progress_reports_skip_unchanged_status_events() -> None:
+    events = [
+        {"status": "IN_QUEUE"},
+        {"status": "IN_QUEUE"},
+        {"status": "IN_PROGRESS", "progress": 0.5},
+        {"status": "IN_PROGRESS", "progress": 0.504},
+        {"status": "IN_PROGRESS", "progress": 0.6},
+        {"status": "COMPLETED"},
+    ]
+
+    class _StreamingClient:
+        async def wait_for_completion(self, model_id: str, request_id: str, **kwargs: Any) -> dict[str, Any]:
+            for event in events:
+                await kwargs["on_status"](event)
+            return events[-1]
+
+    ctx = _Ctx()
+    await server._wait_for_completion_with_progress(
+        _StreamingClient(),  # type: ignore[arg-type]
+        model_id="fal-ai/flux/dev",
+        request_id="req-1",
+        timeout_seconds=10.0,
+        poll_interval_seconds=1.0,
+        ctx=ctx,
+    )
+
+    assert list(ctx.progress_events) == [
+        (0.0, 100.0, "fal-ai/flux/dev status=IN_QUEUE"),
+        (50.0, 100.0, "fal-ai/flux/dev status=IN_PROGRESS"),
+        (60.0, 100.0, "fal-ai/flux/dev status=IN_PROGRESS"),
+        (100.0, 100.0, "fal-ai/flux/dev status=COMPLETED"),
+    ]
 
 
 # Expected behavior: generate should run queue -> completion -> download -> optional repo copy and return structured metadata.
-@pytest.mark.asyncio
-async def test_generate_pipeline_end_to_end(monkeypatch: pytest.MonkeyPatch) -> None:
-    tmp = _workspace_tmp_dir()
-    try:
-        monkeypatch.setenv("FAL_KEY", "Key test")
-        factory = _ClientFactory()
-
-        async def _fake_get_client():
-            return factory.make()
-
-        monkeypatch.setattr(server, "_get_client", _fake_get_client)
-        ctx = _Ctx()
-
-        with respx.mock(assert_all_called=True) as mock:
-            mock.get(re.compile(r"https://cdn\.fal\.ai/.*")).mock(
-                return_value=httpx.Response(200, headers={"Content-Type": "image/png"}, content=b"PNG")
-            )
-            result = await server.generate(
-                ctx=ctx,
-                model_id="fal-ai/flux/dev",
-                prompt="a floating island",
-                output_path=str(tmp / "out" / "hero"),
-                repo_path=str(tmp / "repo" / "hero"),
-                params={"seed": 7},
-            )
-
-        assert Path(result["output_path"]).exists()
-        assert result["output_path"].endswith(".png")
-        assert result["repo_path"] and result["repo_path"].endswith(".png")
-        assert Path(result["repo_path"]).exists()
-        assert result["media_type"] == "image"
-        assert result["duration_ms"] == 1234
-        assert result["cost_usd"] == pytest.approx(0.15)
-        assert ctx.progress_events, "generate should report progress"
-        assert any((event[0] or 0) >= 100 for event in ctx.progress_events)
-        assert factory.closed_clients >= 1
-    finally:
-        shutil.rmtree(tmp, ignore_errors=True)
+@pytest.mark.respx(assert_all_called=True)
+async def test_generate_pipeline_end_to_end(
+    factory: _ClientFactory,
+    cdn: respx.Route,
+    respx_mock: respx.MockRouter,
+    tmp_path: Path,
+) -> None:
+    ctx = _Ctx()
+    result = await server.generate(
+        ctx=ctx,
+        model_id="fal-ai/flux/dev",
+        prompt="a floating island",
+        output_path=str(tmp_path / "out" / "hero"),
+        repo_path=str(tmp_path / "repo" / "hero"),
+        params={"seed": 7},
+    )
+    assert respx_mock.calls.last.request.headers["Authorization"] == "Key client"
+
+    assert Path(result["output_path"]).exists()
+    assert result["output_path"].endswith(".png")
+    assert result["repo_path"] and result["repo_path"].endswith(".png")
+    assert Path(result["repo_path"]).exists()
+    assert result["media_type"] == "image"
+    assert result["duration_ms"] == 1234
+    assert result["cost_usd"] == pytest.approx(0.15)
+    assert ctx.progress_events, "generate should report progress"
+    assert any((event[0] or 0) >= 100 for event in ctx.progress_events)
+    assert factory.closed_clients == 0, "generate should reuse the shared client instead of closing it"
+    assert factory.poll_intervals == [5.0], "polling is only the SSE fallback and should stay sparse"
 
 
 # Expected behavior: generate_batch should return partial failures without aborting successful items.
-@pytest.mark.asyncio
-async def test_generate_batch_partial_failure(monkeypatch: pytest.MonkeyPatch) -> None:
-    tmp = _workspace_tmp_dir()
-    try:
-        monkeypatch.setenv("FAL_KEY", "Key test")
-        factory = _ClientFactory(fail_request_ids={"req-2"})
-
-        async def _fake_get_client():
-            return factory.make()
-
-        monkeypatch.setattr(server, "_get_client", _fake_get_client)
-        ctx = _Ctx()
-
-        with respx.mock(assert_all_called=False) as mock:
-            mock.get(re.compile(r"https://cdn\.fal\.ai/.*")).mock(
-                return_value=httpx.Response(200, headers={"Content-Type": "image/png"}, content=b"IMG")
-            )
-            result = await server.generate_batch(
-                ctx=ctx,
-                model_id="fal-ai/flux/dev",
-                prompt="batch item",
-                count=3,
-                output_dir=str(tmp / "batch"),
-            )
-
-        assert len(result["files"]) == 2
-        assert len(result["failed"]) == 1
-        assert result["failed"][0]["index"] == 2
-    finally:
-        shutil.rmtree(tmp, ignore_errors=True)
+async def test_generate_batch_partial_failure(factory: _ClientFactory, cdn: respx.Route, tmp_path: Path) -> None:
+    factory.fail_request_ids = {"req-2"}
+    ctx = _Ctx()
+    result = await server.generate_batch(
+        ctx=ctx,
+        model_id="fal-ai/flux/dev",
+        prompt="batch item",
+        count=3,
+        output_dir=str(tmp_path / "batch"),
+    )
+
+    assert len(result["files"]) == 2
+    assert len(result["failed"]) == 1
+    assert result["failed"][0]["index"] == 2
+    assert ctx.progress_events[-1] == (100.0, 100.0, "3/3 jobs finished")
+    assert (100.0 / 3, 100.0, "1/3 jobs finished") in ctx.progress_events
+
+
+# Expected behavior: batch outputs should follow prompt order even when jobs finish out of order,
+# and the only progress stream should be the monotonic job count.
+async def test_generate_batch_keeps_job_order_and_single_progress_stream(
+    factory: _ClientFactory,
+    cdn: respx.Route,
+    tmp_path: Path,
+) -> None:
+    factory.delays = {"req-1": 0.05}
+    factory.fail_request_ids = {"req-2"}
+    ctx = _Ctx()
+    result = await server.generate_batch(
+        ctx=ctx,
+        model_id="fal-ai/flux/dev",
+        prompt="batch item",
+        count=4,
+        output_dir=str(tmp_path / "batch"),
+    )
+
+    assert [item["request_id"] for item in result["files"]] == ["req-1", "req-3", "req-4"]
+    assert [item["index"] for item in result["failed"]] == [2]
+    assert [event[2] for event in ctx.progress_events] == [f"{k}/4 jobs finished" for k in range(1, 5)]
+
+
+# Expected behavior: jobs still running at the fan-out deadline should be cancelled and reported, keeping finished ones.
+async def test_generate_batch_cancels_stragglers_at_deadline(
+    monkeypatch: pytest.MonkeyPatch,
+    factory: _ClientFactory,
+    cdn: respx.Route,
+    tmp_path: Path,
+) -> None:
+    monkeypatch.setattr(server, "_FANOUT_DEADLINE_SECONDS", 0.2)
+    factory.hang_request_ids = {"req-3"}
+    result = await server.generate_batch(
+        ctx=_Ctx(),
+        model_id="fal-ai/flux/dev",
+        prompt="batch item",
+        count=3,
+        output_dir=str(tmp_path / "batch"),
+    )
+
+    assert len(result["files"]) == 2
+    assert result["failed"] == [
+        {"index": 3, "error": "JOB_CANCELLED: Job did not finish before the 0.2s deadline.", "cancelled": True}
+    ]
+    assert server.ADMISSION_GATE.active == 0
+    assert factory.cancelled_request_ids == ["req-3"], "abandoned jobs should be cancelled on fal.ai too"
+    # Each wait only gets what is left of the call's budget, never a fresh full timeout.
+    assert all(0.0 < timeout <= 0.2 for timeout in factory.wait_timeouts)
+
+
+# Expected behavior: a job cancelled before the deadline should be reported without blaming the deadline.
+async def test_generate_batch_reports_non_deadline_cancellation(
+    factory: _ClientFactory,
+    cdn: respx.Route,
+    tmp_path: Path,
+) -> None:
+    factory.cancel_request_ids = {"req-2"}
+    result = await server.generate_batch(
+        ctx=_Ctx(),
+        model_id="fal-ai/flux/dev",
+        prompt="batch item",
+        count=2,
+        output_dir=str(tmp_path / "batch"),
+    )
+
+    assert len(result["files"]) == 1
+    assert result["failed"] == [
+        {"index": 2, "error": "JOB_CANCELLED: Job was cancelled before it finished.", "cancelled": True}
+    ]
+
+
+# Expected behavior: a client abort should cancel every in-flight job and release its admission slot.
+async def test_generate_batch_abort_cancels_jobs(factory: _ClientFactory, tmp_path: Path) -> None:
+    factory.hang_request_ids = {"req-1", "req-2"}
+    call = asyncio.create_task(
+        server.generate_batch(
+            ctx=_Ctx(),
+            model_id="fal-ai/flux/dev",
+            prompt="batch item",
+            count=2,
+            output_dir=str(tmp_path / "batch"),
+        )
+    )
+    await asyncio.sleep(0.05)
+    assert server.ADMISSION_GATE.active == 2
+    call.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await call
+    assert server.ADMISSION_GATE.active == 0
+    assert sorted(factory.cancelled_request_ids) == ["req-1", "req-2"]
 
 
 # Expected behavior: generate_compare should return per-model failures while preserving successes.
-@pytest.mark.asyncio
-async def test_generate_compare_partial_failure(monkeypatch: pytest.MonkeyPatch) -> None:
-    tmp = _workspace_tmp_dir()
-    try:
-        monkeypatch.setenv("FAL_KEY", "Key test")
-        factory = _ClientFactory(fail_models={"fal-ai/bad/model"})
-
-        async def _fake_get_client():
-            return factory.make()
-
-        monkeypatch.setattr(server, "_get_client", _fake_get_client)
-        ctx = _Ctx()
-
-        with respx.mock(assert_all_called=False) as mock:
-            mock.get(re.compile(r"https://cdn\.fal\.ai/.*")).mock(
-                return_value=httpx.Response(200, headers={"Content-Type": "image/png"}, content=b"IMG")
-            )
-            result = await server.generate_compare(
-                ctx=ctx,
-                model_ids=["fal-ai/good/model", "fal-ai/bad/model"],
-                prompt="compare item",
-                output_dir=str(tmp / "compare"),
-            )
-
-        assert len(result["files"]) == 1
-        assert len(result["failed"]) == 1
-        assert result["failed"][0]["model_id"] == "fal-ai/bad/model"
-    finally:
-        shutil.rmtree(tmp, ignore_errors=True)
+async def test_generate_compare_partial_failure(factory: _ClientFactory, cdn: respx.Route, tmp_path: Path) -> None:
+    factory.fail_models = {"fal-ai/bad/model"}
+    ctx = _Ctx()
+    result = await server.generate_compare(
+        ctx=ctx,
+        model_ids=["fal-ai/good/model", "fal-ai/bad/model"],
+        prompt="compare item",
+        output_dir=str(tmp_path / "compare"),
+    )
+
+    assert len(result["files"]) == 1
+    assert len(result["failed"]) == 1
+    assert result["failed"][0]["model_id"] == "fal-ai/bad/model"
+
+
+# Expected behavior: aborting a batch mid-submission should cancel on fal.ai every job it already submitted.
+async def test_generate_batch_abort_during_submission_cancels_accepted_jobs(
+    factory: _ClientFactory,
+    tmp_path: Path,
+) -> None:
+    factory.hang_request_ids = {"req-1", "req-2"}
+    factory.hang_submits = {3}
+    call = asyncio.create_task(
+        server.generate_batch(
+            ctx=_Ctx(),
+            model_id="fal-ai/flux/dev",
+            prompt="batch item",
+            count=3,
+            output_dir=str(tmp_path / "batch"),
+        )
+    )
+    await asyncio.sleep(0.05)
+    call.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await call
+    assert server.ADMISSION_GATE.active == 0
+    assert sorted(factory.cancelled_request_ids) == ["req-1", "req-2"]
+
+
+# Expected behavior: MAX_CONCURRENT_JOBS should bound jobs running on fal.ai across concurrent tool calls.
+async def test_admission_gate_bounds_jobs_across_tool_calls(
+    monkeypatch: pytest.MonkeyPatch,
+    factory: _ClientFactory,
+    cdn: respx.Route,
+    tmp_path: Path,
+) -> None:
+    monkeypatch.setattr(server, "ADMISSION_GATE", AdmissionGate(2))
+    factory.delays = {f"req-{n}": 0.01 for n in range(1, 6)}
+    batch, compare = await asyncio.gather(
+        server.generate_batch(
+            ctx=_Ctx(),
+            model_id="fal-ai/flux/dev",
+            prompt="batch item",
+            count=3,
+            output_dir=str(tmp_path / "batch"),
+        ),
+        server.generate_compare(
+            ctx=_Ctx(),
+            model_ids=["fal-ai/good/model", "fal-ai/other/model"],
+            prompt="compare item",
+            output_dir=str(tmp_path / "compare"),
+        ),
+    )
+
+    assert len(batch["files"]) == 3
+    assert len(compare["files"]) == 2
+    assert factory.peak_running == 2
@@ -1,36 +1,40 @@
 from __future__ import annotations
 
+import asyncio
+import gc
+from collections import Counter
 from typing import Any
 
 import pytest
 
 import genvoy.server as server
+from genvoy import config
 from genvoy.errors import GenvoyToolError
 
 
 class _ToolClient:
     def __init__(self) -> None:
         self.closed = False
-        self.calls: list[tuple[str, tuple[Any, ...]]] = []
+        self.calls: Counter[tuple[str, tuple[Any, ...]]] = Counter()
 
     async def search_models(self, query: str, category: str | None, cursor: str | None) -> dict[str, Any]:
-        self.calls.append(("search_models", (query, category, cursor)))
+        self.calls[("search_models", (query, category, cursor))] += 1
         return {"models": [{"endpoint_id": "fal-ai/flux/dev"}]}
 
     async def get_schema(self, model_id: str) -> dict[str, Any]:
-        self.calls.append(("get_schema", (model_id,)))
+        self.calls[("get_schema", (model_id,))] += 1
         return {"openapi": {"type": "object"}}
 
     async def estimate_cost(self, model_id: str, count: int) -> dict[str, Any]:
-        self.calls.append(("estimate_cost", (model_id, count)))
+        self.calls[("estimate_cost", (model_id, count))] += 1
         return {"estimate": {"total": 0.1}}
 
     async def get_job_status(self, model_id: str, request_id: str) -> dict[str, Any]:
-        self.calls.append(("get_job_status", (model_id, request_id)))
+        self.calls[("get_job_status", (model_id, request_id))] += 1
         return {"status": "IN_PROGRESS"}
 
     async def cancel_job(self, model_id: str, request_id: str) -> dict[str, Any]:
-        self.calls.append(("cancel_job", (model_id, request_id)))
+        self.calls[("cancel_job", (model_id, request_id))] += 1
         return {"cancelled": True}
 
     async def aclose(self) -> None:
@@ -38,7 +42,6 @@ class _ToolClient:
 
 
 # Expected behavior: read-only/search tools should call underlying client methods and return their payload.
-@pytest.mark.asyncio
 async def test_search_schema_and_estimate_tools(monkeypatch: pytest.MonkeyPatch) -> None:
     client = _ToolClient()
 
@@ -60,11 +63,10 @@ async def test_search_schema_and_estimate_tools(monkeypatch: pytest.MonkeyPatch)
     assert ("search_models", ("flux", None, "legacy-2")) in client.calls
     assert ("get_schema", ("fal-ai/flux/dev",)) in client.calls
     assert ("estimate_cost", ("fal-ai/flux/dev", 3)) in client.calls
-    assert client.closed is True
+    assert client.closed is False, "tools should reuse the shared client instead of closing it"
 
 
 # Expected behavior: queue management tools should validate IDs and proxy to client when valid.
-@pytest.mark.asyncio
 async def test_get_job_status_and_cancel_tools(monkeypatch: pytest.MonkeyPatch) -> None:
     client = _ToolClient()
 
@@ -83,16 +85,119 @@ async def test_get_job_status_and_cancel_tools(monkeypatch: pytest.MonkeyPatch)
 
 
 # Expected behavior: invalid model IDs should surface INVALID_MODEL_ID from validation boundary.
-@pytest.mark.asyncio
 async def test_tool_validation_surfaces_invalid_model_id() -> None:
     with pytest.raises(GenvoyToolError) as exc:
         await server.get_schema(None, "invalid model id")
     assert exc.value.code == "INVALID_MODEL_ID"
 
 
+# Expected behavior: identical concurrent read-only calls should share one upstream request; later calls refetch.
+async def test_identical_concurrent_reads_are_coalesced(monkeypatch: pytest.MonkeyPatch) -> None:
+    client = _ToolClient()
+    release = asyncio.Event()
+    original = client.get_schema
+
+    async def _slow_get_schema(model_id: str) -> dict[str, Any]:
+        await release.wait()
+        return await original(model_id)
+
+    client.get_schema = _slow_get_schema  # type: ignore[method-assign]
+
+    async def _fake_get_client():
+        return client
+
+    monkeypatch.setattr(server, "_get_client", _fake_get_client)
+
+    pending = [asyncio.create_task(server.get_schema(None, "fal-ai/flux/dev")) for _ in range(3)]
+    other = asyncio.create_task(server.get_schema(None, "fal-ai/other/model"))
+    await asyncio.sleep(0)
+    pending[0].cancel()
+    release.set()
+    results = await asyncio.gather(*pending[1:], other)
+
+    assert all(result["openapi"]["type"] == "object" for result in results)
+    assert client.calls[("get_schema", ("fal-ai/flux/dev",))] == 1
+    assert ("get_schema", ("fal-ai/other/model",)) in client.calls
+    assert server._INFLIGHT == {}
+
+    await server.get_schema(None, "fal-ai/flux/dev")
+    assert client.calls[("get_schema", ("fal-ai/flux/dev",))] == 2
+
+
+# Expected behavior: a coalesced failure nobody is left to await should not log an unretrieved exception.
+async def test_coalesced_failure_after_callers_cancel_is_retrieved(monkeypatch: pytest.MonkeyPatch) -> None:
+    client = _ToolClient()
+    fail = asyncio.Event()
+
+    async def _failing_get_schema(model_id: str) -> dict[str, Any]:
+        await fail.wait()
+        raise GenvoyToolError("FAL_API_ERROR", "boom")
+
+    client.get_schema = _failing_get_schema  # type: ignore[method-assign]
+
+    async def _fake_get_client():
+        return client
+
+    monkeypatch.setattr(server, "_get_client", _fake_get_client)
+    loop = asyncio.get_running_loop()
+    reported: list[dict[str, Any]] = []
+    previous_handler = loop.get_exception_handler()
+    loop.set_exception_handler(lambda _loop, context: reported.append(context))
+    try:
+        caller = asyncio.create_task(server.get_schema(None, "fal-ai/flux/dev"))
+        await asyncio.sleep(0)
+        (shared,) = server._INFLIGHT.values()
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+        fail.set()
+        await asyncio.wait((shared,))
+        del shared
+        gc.collect()
+    finally:
+        loop.set_exception_handler(previous_handler)
+
+    assert server._INFLIGHT == {}
+    assert reported == []
+
+
+# Expected behavior: over-long prompts should map to PROMPT_TOO_LONG with the configured limit in the message.
+async def test_tool_validation_surfaces_prompt_too_long() -> None:
+    with pytest.raises(GenvoyToolError) as exc:
+        await server.generate(None, "fal-ai/flux/dev", "x" * (config.MAX_PROMPT_LENGTH + 1), "out/file")
+    assert exc.value.code == "PROMPT_TOO_LONG"
+    assert str(config.MAX_PROMPT_LENGTH) in exc.value.message
+
+
 # Expected behavior: conflicting cursor/page values should be rejected to avoid ambiguous pagination.
-@pytest.mark.asyncio
 async def test_search_models_rejects_conflicting_cursor_and_page() -> None:
     with pytest.raises(GenvoyToolError) as exc:
         await server.search_models(None, "flux", cursor="cursor-A", page="cursor-B")
     assert exc.value.code == "AMBIGUOUS_PAGINATION_CURSOR"
+
+
+# Expected behavior: _get_client should reuse one FalClient per key and rebuild it when FAL_KEY changes.
+async def test_get_client_reuses_instance_until_key_changes(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(server, "_CLIENT", None)
+    monkeypatch.setenv("FAL_KEY", "first")
+    first = await server._get_client()
+    assert await server._get_client() is first
+
+    monkeypatch.setenv("FAL_KEY", "second")
+    second = await server._get_client()
+    assert second is not first
+    assert second.fal_key == "Key second"
+
+
+# Expected behavior: server shutdown should drop the cached client and close the shared HTTP pool.
+async def test_lifespan_closes_shared_client_on_shutdown(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(server, "_CLIENT", None)
+    monkeypatch.setenv("FAL_KEY", "abc123")
+    client = await server._get_client()
+    pool = client.client
+
+    async with server._lifespan(server.mcp):
+        pass
+
+    assert server._CLIENT is None
+    assert pool.is_closed